@@ -1,11 +1,10 @@
 import streamlit as st
 import auth
-import logic
-import re
-from music_recommender import MusicRecommender
+import metrics
+import startup
 from datetime import datetime
-import pandas as pd
-import plotly.express as px
+# pandas, plotly and the ML modules are imported inside the pages that use
+# them, so the login screen renders without paying for them (see startup.py)
 
 # --- PAGE CONFIG ---
 st.set_page_config(page_title="Mental Health AI", page_icon="🌿", layout="wide")
@@ -134,10 +133,17 @@ def main():
         st.session_state.page = "dashboard"
     
     if not st.session_state.authenticated:
-        render_auth()
+        with metrics.timer("page.auth"):
+            render_auth()
+    elif st.query_params.get("admin") == "metrics":
+        # Hidden admin page: open the app with ?admin=metrics
+        render_metrics()
     else:
+        # Load models in the background while the user reads the dashboard
+        startup.prewarm()
         if st.session_state.page == "emergency":
-            render_emergency()
+            with metrics.timer("page.emergency"):
+                render_emergency()
         else:
             render_dashboard()
 
@@ -205,22 +211,47 @@ def render_dashboard():
             st.rerun()
 
     # Route to views
-    if page == "overview":
-        show_overview()
-    elif page == "wellness":
-        show_wellness()
-    elif page == "suicide":
-        show_suicide()
-    elif page == "condition":
-        show_condition()
-    elif page == "dsm5":
-        show_dsm5()
-    elif page == "situational":
-        show_situational()
-    elif page == "explorer":
-        show_explorer()
+    with metrics.timer(f"page.{page}"):
+        if page == "overview":
+            show_overview()
+        elif page == "wellness":
+            show_wellness()
+        elif page == "suicide":
+            show_suicide()
+        elif page == "condition":
+            show_condition()
+        elif page == "dsm5":
+            show_dsm5()
+        elif page == "situational":
+            show_situational()
+        elif page == "explorer":
+            show_explorer()
+
+def render_metrics():
+    import pandas as pd
+    st.title("Runtime Metrics ⏱️")
+    snapshot = metrics.get_metrics().snapshot()
+    rows = [
+        {"Stage": stage, "Calls": s["count"], "Mean (ms)": s["mean"] * 1e3,
+         "p50 (ms)": s["p50"] * 1e3, "p95 (ms)": s["p95"] * 1e3, "p99 (ms)": s["p99"] * 1e3}
+        for stage, s in snapshot["stages"].items()
+    ]
+    st.subheader("Stage Latency")
+    st.dataframe(pd.DataFrame(rows).round(3), use_container_width=True)
+    c1, c2 = st.columns(2)
+    with c1:
+        st.subheader("Counters")
+        st.json(snapshot["counters"])
+    with c2:
+        st.subheader("Caches & Models")
+        st.json(snapshot["collected"])
+    with st.expander("Prometheus text"):
+        st.code(metrics.get_metrics().prometheus(), language="text")
 
 def show_overview():
+    import logic
+    import inference_service
+    import history_store
     st.title("Daily Check-in 🏠")
     st.markdown('<div class="main-card">', unsafe_allow_html=True)
     journal = st.text_area("How are you feeling in this moment?", height=150, 
@@ -228,12 +259,23 @@ def show_overview():
     
     if st.button("Run Clinical Analysis"):
         if journal.strip():
+            # Crisis phrases decide the banner from one rule scan, before any model runs
+            triage = logic.SituationalAnalyzer().triage(journal, max_tier="rules")
+            if triage.is_emergency:
+                st.error("🚨 Your words suggest you may be in crisis. Please open 🆘 Emergency Support now.")
             with st.spinner("Analyzing signals..."):
-                diag = logic.DiagnosticAssistant()
-                situ = logic.SituationalAnalyzer()
-                st.session_state.last_results = diag.analyze(journal)
-                st.session_state.last_situ = situ.analyze(journal)
+                try:
+                    # Shared micro-batching service: concurrent sessions reuse one model pass
+                    diag_res, situ_res = inference_service.get_service().analyze(journal)
+                except (inference_service.ServiceOverloaded, inference_service.ServiceStopped, TimeoutError):
+                    diag_res, situ_res = logic.analyze_checkin(journal)
+                st.session_state.last_results = diag_res
+                st.session_state.last_situ = situ_res
                 st.session_state.last_journal = journal
+                try:
+                    history_store.get_history().record(st.session_state.user, diag_res, situ_res)
+                except Exception as e:
+                    print(f"History Error: {e}")
                 st.success("New analysis synchronized. Explore the tabs for details.")
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -253,32 +295,51 @@ def show_overview():
             st.markdown(f'<div class="stat-box"><h4>System Status</h4><div style="font-size: 1.4rem; font-weight: 600; color: {"#FF6B6B" if situ_res["is_emergency"] else "#8AA6A3"}">{status}</div></div>', unsafe_allow_html=True)
 
 def show_wellness():
+    from music_recommender import MusicRecommender
     st.title("Wellness Analysis 🏆")
     if 'last_situ' not in st.session_state:
         st.warning("Please perform a check-in on the Dashboard Overview first.")
+    else:
+        situ = st.session_state.last_situ
+        st.markdown('<div class="main-card">', unsafe_allow_html=True)
+        st.subheader("Peace of Mind (PoM) Metric")
+        st.progress(situ['pom_score'] / 100)
+        st.write(f"Your current stability index is **{situ['pom_score']}%**. This is calculated based on emotional density and linguistic markers.")
+
+        # Music Therapy Integration
+        top_state = "Stable"
+        if situ['is_emergency']: top_state = "Panic Attack"
+        elif situ['pom_score'] < 40: top_state = "High Stress"
+
+        rec = MusicRecommender.get_recommendation(top_state)
+        st.markdown("---")
+        st.subheader("Therapeutic Soundscapes")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.write(f"**Recommended Genre:** {rec['Recommended_Genre']}")
+            st.write(f"**Target Tempo:** {rec['Tempo']}")
+        with col2:
+            st.info(rec['Clinical_Logic'])
+        st.markdown('</div>', unsafe_allow_html=True)
+
+    # The saved history is shown even before this session's first check-in
+    show_wellness_trend()
+
+def show_wellness_trend():
+    import pandas as pd
+    import plotly.express as px
+    import history_store
+    # Trend from the precomputed rollups (one row per day/week, not per check-in)
+    st.subheader("Your Wellness Trend")
+    period = st.radio("View", ["day", "week"], horizontal=True, format_func=lambda p: "Daily" if p == "day" else "Weekly")
+    trend = pd.DataFrame(history_store.get_history().rollups(st.session_state.user, period))
+    if trend.empty:
+        st.info("Your check-in history will appear here.")
         return
-        
-    situ = st.session_state.last_situ
-    st.markdown('<div class="main-card">', unsafe_allow_html=True)
-    st.subheader("Peace of Mind (PoM) Metric")
-    st.progress(situ['pom_score'] / 100)
-    st.write(f"Your current stability index is **{situ['pom_score']}%**. This is calculated based on emotional density and linguistic markers.")
-    
-    # Music Therapy Integration
-    top_state = "Stable"
-    if situ['is_emergency']: top_state = "Panic Attack"
-    elif situ['pom_score'] < 40: top_state = "High Stress"
-    
-    rec = MusicRecommender.get_recommendation(top_state)
-    st.markdown("---")
-    st.subheader("Therapeutic Soundscapes")
-    col1, col2 = st.columns(2)
-    with col1:
-        st.write(f"**Recommended Genre:** {rec['Recommended_Genre']}")
-        st.write(f"**Target Tempo:** {rec['Tempo']}")
-    with col2:
-        st.info(rec['Clinical_Logic'])
-    st.markdown('</div>', unsafe_allow_html=True)
+    fig = px.line(trend, x='bucket', y='mean_pom', markers=True, hover_data=['checkins', 'emergencies', 'top_condition'],
+                  labels={'bucket': 'Date', 'mean_pom': 'Mean PoM (%)'}, color_discrete_sequence=['#8AA6A3'])
+    fig.update_layout(height=300, margin=dict(l=0, r=0, t=0, b=0), yaxis_range=[0, 100])
+    st.plotly_chart(fig, use_container_width=True)
 
 def show_suicide():
     st.title("Suicide Risk (ML) 🎯")
@@ -304,6 +365,8 @@ def show_suicide():
     st.markdown('</div>', unsafe_allow_html=True)
 
 def show_condition():
+    import pandas as pd
+    import plotly.express as px
     st.title("Condition Prediction 🔮")
     if 'last_results' not in st.session_state:
         st.warning("Please perform a check-in on the Dashboard Overview first.")
@@ -340,6 +403,7 @@ def show_dsm5():
     st.markdown('</div>', unsafe_allow_html=True)
 
 def show_situational():
+    import logic
     st.title("Situational Analyzer 🌱")
     if 'last_journal' not in st.session_state:
         st.warning("Please perform a check-in on the Dashboard Overview first.")
@@ -349,23 +413,17 @@ def show_situational():
     st.markdown('<div class="main-card">', unsafe_allow_html=True)
     st.subheader("Stressor Pattern Detection")
     
-    stressors = {
-        "Academic": [r"work", r"study", r"grade", r"exam", r"assignment"],
-        "Social": [r"friend", r"lonely", r"argument", r"relationship", r"people"],
-        "Financial": [r"money", r"debt", r"broke", r"pay", r"bills"]
-    }
-    
     found = False
-    for cat, patterns in stressors.items():
-        if any(re.search(p, journal, re.IGNORECASE) for p in patterns):
-            st.info(f"📍 Potential **{cat}** stressor detected in your narrative.")
-            found = True
+    for cat in logic.detect_stressors(journal):
+        st.info(f"📍 Potential **{cat}** stressor detected in your narrative.")
+        found = True
             
     if not found:
         st.write("No distinct situational stressors isolated in current input.")
     st.markdown('</div>', unsafe_allow_html=True)
 
 def show_explorer():
+    import dataset_access
     st.title("Dataset Explorer 📊")
     
     datasets = {
@@ -377,22 +435,31 @@ def show_explorer():
     st.caption(datasets[target_file])
     
     try:
-        if target_file == "Suicide_Detection.csv":
-            # Load a sample for performance
-            df = pd.read_csv(target_file).head(500)
-            st.warning("Displaying a sample of 500 records from the Suicide Detection dataset for performance.")
-        else:
-            df = pd.read_csv(target_file)
-
+        # Indexed, paged reads: only the visible rows and columns are parsed
+        dataset = dataset_access.get_dataset(target_file)
         st.markdown('<div class="main-card">', unsafe_allow_html=True)
         st.subheader(f"Source Data: {target_file}")
+
+        c1, c2, c3 = st.columns([1, 1, 2])
+        with c1:
+            page_size = st.selectbox("Rows per page", [50, 100, 500], index=1)
+        with c2:
+            page = st.number_input("Page", min_value=1, max_value=dataset.n_pages(page_size), value=1) - 1
+        with c3:
+            columns = st.multiselect("Columns", dataset.columns, default=dataset.columns)
+
+        df = dataset.page(page, page_size, columns=columns or None)
         st.dataframe(df, use_container_width=True)
-        
+
         c1, c2 = st.columns(2)
         with c1:
-            st.write("**Total Records (Current View):**", len(df))
+            st.write("**Total Records:**", dataset.n_rows)
         with c2:
-            st.write("**Columns:**", len(df.columns))
+            st.write("**Columns:**", len(dataset.columns))
+
+        with st.expander("Column statistics"):
+            column = st.selectbox("Column", dataset.columns)
+            st.json(dataset.column_stats(column))
         st.markdown('</div>', unsafe_allow_html=True)
     except Exception as e:
         st.error(f"Error loading dataset: {e}")
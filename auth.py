@@ -1,47 +1,58 @@
-import sqlite3
-import hashlib
 import secrets
+import passwords
+import metrics
+from user_store import UserStore
+
+# Salt for the dummy verification of unknown usernames
+DUMMY_SALT = "0" * 32
+
+# Shared per-process store: a bounded pool of connections to users.db
+_store = UserStore('users.db')
+
+def get_store():
+    """Returns the shared users.db store (also used by history_store.py)."""
+    return _store
 
 def init_db():
-    conn = sqlite3.connect('users.db')
-    c = conn.cursor()
-    # Updated schema to include salt
-    c.execute('''CREATE TABLE IF NOT EXISTS users
-                 (username TEXT PRIMARY KEY, password_hash TEXT, salt TEXT, email TEXT)''')
-    conn.commit()
-    conn.close()
+    """Runs the one-time schema migration (cheap no-op after the first call)."""
+    _store.migrate()
 
 def hash_pass(password, salt):
-    """Hashes the password with a salt using SHA-256."""
-    return hashlib.sha256((password + salt).encode()).hexdigest()
+    """Hashes the password with a salt using the current KDF settings (see passwords.py)."""
+    return passwords.hash_password(password, salt)
 
+@metrics.timed("auth.register")
 def register_user(username, password, email=""):
     """Registers a new user with a salted password hash."""
     try:
         salt = secrets.token_hex(16)
         password_hash = hash_pass(password, salt)
-        
-        conn = sqlite3.connect('users.db')
-        c = conn.cursor()
-        c.execute("INSERT INTO users VALUES (?, ?, ?, ?)", (username, password_hash, salt, email))
-        conn.commit()
-        conn.close()
-        return True
-    except sqlite3.IntegrityError:
-        return False
+        return _store.add_user(username, password_hash, salt, email)
     except Exception as e:
         print(f"Registration Error: {e}")
         return False
 
+@metrics.timed("auth.login")
 def login_user(username, password):
-    """Verifies user credentials by hashing the input with the stored salt."""
-    conn = sqlite3.connect('users.db')
-    c = conn.cursor()
-    c.execute("SELECT password_hash, salt FROM users WHERE username=?", (username,))
-    user = c.fetchone()
-    conn.close()
-    
-    if user:
-        stored_hash, salt = user
-        return hash_pass(password, salt) == stored_hash
-    return False
+    """
+    Verifies user credentials by hashing the input with the stored salt.
+    Legacy SHA-256 rows and outdated KDF costs are rehashed on success.
+    Unknown usernames run the same KDF against a dummy hash, so response
+    time does not reveal which accounts exist.
+    """
+    user = _store.get_credentials(username)
+
+    if not user:
+        passwords.verify_password(password, DUMMY_SALT, passwords.dummy_hash())
+        return False
+
+    stored_hash, salt = user
+    if not passwords.verify_password(password, salt, stored_hash):
+        return False
+    if passwords.needs_rehash(stored_hash):
+        try:
+            new_salt = secrets.token_hex(16)
+            _store.update_password(username, hash_pass(password, new_salt), new_salt)
+        except Exception as e:
+            print(f"Rehash Error: {e}")
+    return True
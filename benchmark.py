@@ -0,0 +1,253 @@
+"""
+Benchmark Suite
+Reproducible end-to-end timings on synthetic journal corpora (short,
+typical and 10k-word entries, with and without crisis markers) for the
+analyzers, music recommendations, auth and training throughput.
+
+    python benchmark.py --out before.json
+    python benchmark.py --out after.json
+    python benchmark.py --compare before.json after.json --threshold 0.10
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+SEED = 1234
+
+# Words per journal for each corpus size
+SIZES = {"short": 12, "typical": 150, "long": 10_000}
+
+NEUTRAL = (
+    "today went to class and then had lunch with my roommate we talked about the weekend "
+    "the weather was nice so I walked home and cooked dinner later I read a book and watched "
+    "a show before bed tomorrow I have a lab and a meeting with my advisor about the project"
+).split()
+NEGATIVE = ["alone", "worried", "nobody", "failing", "hate", "anxious", "sad", "stress", "exam",
+            "tired", "panic", "lonely", "argument", "grade", "assignment"]
+CRISIS = ["i feel hopeless", "i want to end it", "i am done with life", "thinking about suicide"]
+
+
+def make_journal(rng, n_words, crisis):
+    words = rng.choice(NEUTRAL, n_words).astype(object)
+    # Roughly one negative marker every 15 words
+    marks = rng.random(n_words) < 1 / 15
+    words[marks] = rng.choice(NEGATIVE, int(marks.sum()))
+    if crisis:
+        words[rng.integers(n_words)] = rng.choice(CRISIS)
+    return " ".join(words)
+
+
+def make_corpus(size, crisis, n=20, seed=SEED):
+    """
+    Returns `n` distinct journals; identical for the same arguments and seed.
+    """
+    rng = np.random.default_rng([seed, list(SIZES).index(size), int(crisis)])
+    return [make_journal(rng, SIZES[size], crisis) for _ in range(n)]
+
+
+def measure(fn, inputs, min_time=0.5, max_calls=2000, warmup=2):
+    """
+    Calls fn(x) cycling over `inputs` until `min_time` has elapsed.
+    Returns per-call latency statistics in milliseconds.
+    """
+    for x in inputs[:warmup]:
+        fn(x)
+    times = []
+    start = time.perf_counter()
+    while len(times) < max_calls:
+        x = inputs[len(times) % len(inputs)]
+        t = time.perf_counter()
+        fn(x)
+        times.append(time.perf_counter() - t)
+        if time.perf_counter() - start >= min_time and len(times) >= len(inputs):
+            break
+    ms = np.array(times) * 1e3
+    return {
+        "calls": len(ms),
+        "mean_ms": float(ms.mean()),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "ops_per_s": float(len(ms) / (ms.sum() / 1e3)),
+    }
+
+
+def bench_analyzers(results, min_time):
+    from logic import DiagnosticAssistant, SituationalAnalyzer, analyze_checkin
+
+    diag = DiagnosticAssistant()
+    situ = SituationalAnalyzer()
+    for size in SIZES:
+        for crisis in (False, True):
+            corpus = make_corpus(size, crisis)
+            tag = f"{size}-{'crisis' if crisis else 'calm'}"
+            results[f"diagnostic.analyze[{tag}]"] = measure(diag.analyze, corpus, min_time)
+            results[f"situational.analyze[{tag}]"] = measure(situ.analyze, corpus, min_time)
+            results[f"checkin.uncached[{tag}]"] = measure(
+                lambda text: analyze_checkin(text, diag, situ, cache=False), corpus, min_time)
+
+
+def bench_music(results, min_time):
+    from music_recommender import MusicRecommender
+
+    states = ["Anxiety", "Depression", "Panic Attack", "High Stress", "Stable", "unknown"]
+    results["music.get_recommendation"] = measure(MusicRecommender.get_recommendation, states, min_time)
+
+
+def bench_auth(results, min_time):
+    import auth
+    from user_store import UserStore
+
+    original = auth._store
+    with tempfile.TemporaryDirectory() as tmp:
+        auth._store = UserStore(os.path.join(tmp, "bench_users.db"))
+        try:
+            auth.init_db()
+            names = [f"user{i}" for i in range(50)]
+            counter = iter(range(10 ** 9))
+            results["auth.register"] = measure(
+                lambda _: auth.register_user(f"bench{next(counter)}", "pw", ""), names, min_time, max_calls=200)
+            for name in names:
+                auth.register_user(name, "pw", "")
+            results["auth.login"] = measure(lambda name: auth.login_user(name, "pw"), names, min_time, max_calls=200)
+            results["auth.login_unknown_user"] = measure(
+                lambda name: auth.login_user("missing-" + name, "pw"), names, min_time)
+        finally:
+            auth._store.close()
+            auth._store = original
+
+
+def bench_training(results, n_docs=4000):
+    from train_models import _fit_binary, _fit_vectorizer, label_texts
+
+    rng = np.random.default_rng([SEED, 99])
+    crisis = rng.random(n_docs) < 0.5
+    texts = np.array([make_journal(rng, SIZES["typical"], c) for c in crisis])
+
+    start = time.perf_counter()
+    labels = label_texts(texts)
+    label_s = time.perf_counter() - start
+    _, X = _fit_vectorizer(texts)
+    vectorize_s = time.perf_counter() - start - label_s
+    _fit_binary(X, crisis.astype(int))
+    for c in np.unique(labels):
+        _fit_binary(X, (labels == c).astype(int))
+    total_s = time.perf_counter() - start
+
+    results["training.pipeline"] = {
+        "docs": n_docs,
+        "label_s": label_s,
+        "vectorize_s": vectorize_s,
+        "fit_s": total_s - label_s - vectorize_s,
+        "docs_per_s": n_docs / total_s,
+    }
+
+
+def environment():
+    import sklearn
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "sklearn": sklearn.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "seed": SEED,
+    }
+
+
+def run(groups, min_time):
+    results = {}
+    for name in groups:
+        print(f"Running {name} benchmarks...", file=sys.stderr)
+        if name == "analyzers":
+            bench_analyzers(results, min_time)
+        elif name == "music":
+            bench_music(results, min_time)
+        elif name == "auth":
+            bench_auth(results, min_time)
+        elif name == "training":
+            bench_training(results)
+    return {"environment": environment(), "results": results}
+
+
+# Latency metrics grow on regression, throughput metrics shrink
+LOWER_IS_BETTER = ("p50_ms", "mean_ms", "fit_s", "vectorize_s", "label_s")
+HIGHER_IS_BETTER = ("docs_per_s",)
+
+
+def compare(baseline, current, threshold=0.10, min_delta_ms=0.01):
+    """
+    Returns (rows, regressions) comparing p50 latency (or training
+    throughput) of every benchmark present in both runs. Latency changes
+    smaller than `min_delta_ms` are timer noise and never flagged.
+    """
+    rows, regressions = [], []
+    for name, new in current["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            continue
+        key = "p50_ms" if "p50_ms" in new else "docs_per_s"
+        change = new[key] / old[key] - 1 if old[key] else 0.0
+        if key in LOWER_IS_BETTER:
+            worse = change > threshold and new[key] - old[key] > min_delta_ms
+        else:
+            worse = change < -threshold
+        rows.append((name, key, old[key], new[key], change, worse))
+        if worse:
+            regressions.append(name)
+    return rows, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end benchmark suite")
+    parser.add_argument("--out", help="write JSON results to this file (default: stdout)")
+    parser.add_argument("--only", nargs="+", choices=["analyzers", "music", "auth", "training"],
+                        default=["analyzers", "music", "auth", "training"])
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds per benchmark")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+                        help="compare two result files instead of running")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change flagged as regression")
+    parser.add_argument("--min-delta-ms", type=float, default=0.01, help="ignore smaller absolute latency changes")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+        rows, regressions = compare(baseline, current, args.threshold, args.min_delta_ms)
+        for name, key, old, new, change, worse in rows:
+            flag = "REGRESSION" if worse else ""
+            print(f"{name:<42} {key:<10} {old:12.3f} -> {new:12.3f} {change:+7.1%} {flag}")
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+        sys.exit(1 if regressions else 0)
+
+    report = run(args.only, args.min_time)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+        for name, stats in report["results"].items():
+            summary = f"p50 {stats['p50_ms']:.3f} ms" if "p50_ms" in stats else f"{stats['docs_per_s']:.0f} docs/s"
+            print(f"{name:<42} {summary}")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
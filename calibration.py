@@ -0,0 +1,113 @@
+"""
+Score Calibration
+Maps raw LinearSVC decision scores to calibrated probabilities through
+piecewise-linear lookup tables fitted once on held-out data (isotonic
+regression or Platt scaling). Inference is one np.interp per class.
+"""
+
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+
+METHODS = ("isotonic", "platt")
+# Knots used to tabulate a Platt sigmoid
+PLATT_KNOTS = 64
+
+
+def fit_curve(scores, y, method="isotonic"):
+    """
+    Fits P(y=1 | score) and returns it as increasing knots (xs, ps) for np.interp.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if method == "isotonic":
+        from sklearn.isotonic import IsotonicRegression
+        iso = IsotonicRegression(y_min=0.0, y_max=1.0, out_of_bounds="clip").fit(scores, y)
+        return iso.X_thresholds_, iso.y_thresholds_
+    if method == "platt":
+        from sklearn.linear_model import LogisticRegression
+        lr = LogisticRegression(C=1e6).fit(scores[:, None], y)
+        xs = np.linspace(scores.min(), scores.max(), PLATT_KNOTS)
+        return xs, lr.predict_proba(xs[:, None])[:, 1]
+    raise ValueError(f"Unknown calibration method: {method}")
+
+
+class Calibration:
+    """
+    Lookup tables for both models: one curve per multi-condition class
+    (one-vs-rest, renormalized across classes) and one for suicide risk.
+    """
+
+    def __init__(self, multi_classes, multi_curves, suicide_curve, method, info=None):
+        self.multi_classes = list(multi_classes)
+        self.multi_curves = [(np.asarray(x, dtype=np.float64), np.asarray(p, dtype=np.float64))
+                             for x, p in multi_curves]
+        self.suicide_curve = tuple(np.asarray(a, dtype=np.float64) for a in suicide_curve)
+        self.method = method
+        self.info = info or {}
+
+    @classmethod
+    def fit(cls, multi_scores, multi_labels, multi_classes, suicide_scores, suicide_labels, method="isotonic"):
+        multi_labels = np.asarray(multi_labels)
+        curves = [fit_curve(multi_scores[:, k], multi_labels == c, method) for k, c in enumerate(multi_classes)]
+        return cls(multi_classes, curves, fit_curve(suicide_scores, suicide_labels, method), method)
+
+    def multi_probs(self, scores):
+        """
+        (n, n_classes) decision scores -> calibrated class probabilities.
+        """
+        probs = np.column_stack([np.interp(scores[:, k], x, p) for k, (x, p) in enumerate(self.multi_curves)])
+        total = probs.sum(axis=1, keepdims=True)
+        uniform = np.full_like(probs, 1 / probs.shape[1])
+        return np.divide(probs, total, out=uniform, where=total > 0)
+
+    def suicide_probs(self, scores):
+        """
+        Binary decision scores -> calibrated P(suicide risk).
+        """
+        return np.interp(scores, *self.suicide_curve)
+
+    def save(self, path):
+        data = {
+            "method": self.method,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "multi_classes": self.multi_classes,
+            "multi": [{"x": x.tolist(), "p": p.tolist()} for x, p in self.multi_curves],
+            "suicide": {"x": self.suicide_curve[0].tolist(), "p": self.suicide_curve[1].tolist()},
+            "info": self.info,
+        }
+        with open(path + ".tmp", "w") as f:
+            json.dump(data, f)
+        # Replaced atomically: the registry may reload it from another process
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        return cls(
+            data["multi_classes"],
+            [(c["x"], c["p"]) for c in data["multi"]],
+            (data["suicide"]["x"], data["suicide"]["p"]),
+            data["method"],
+            data.get("info"),
+        )
+
+
+def brier(probs, y):
+    return float(np.mean((probs - y) ** 2))
+
+
+def expected_calibration_error(probs, y, bins=10):
+    """
+    Weighted mean |accuracy - confidence| over equal-width confidence bins.
+    """
+    edges = np.minimum((probs * bins).astype(int), bins - 1)
+    error = 0.0
+    for b in range(bins):
+        mask = edges == b
+        if mask.any():
+            error += mask.mean() * abs(y[mask].mean() - probs[mask].mean())
+    return float(error)
@@ -0,0 +1,279 @@
+"""
+Dataset Access
+Lazy, paginated access to large CSVs for the Dataset Explorer. A one-time,
+quote-aware scan records the byte offset of every row in a sidecar index
+under .cache/, so any page is read with one seek and only the requested
+columns are parsed. Column statistics are computed once and cached too.
+"""
+
+import io
+import json
+import os
+import threading
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+SCAN_CHUNK = 1 << 24 # bytes per scan block
+STATS_CHUNK = 100_000 # rows per block when computing column statistics
+MAX_DISTINCT = 10_000 # stop counting values beyond this many distinct ones
+INDEX_VERSION = 2 # bump when the row index layout changes (rebuilds cached indexes)
+
+
+def _row_offsets(path):
+    """
+    Returns the byte offset of every record boundary (start of header, start
+    of each data row, end of file). Newlines inside quoted fields are skipped:
+    a newline ends a record only when an even number of quotes precede it,
+    which also holds for escaped "" pairs. Empty lines are not records, as
+    with pandas' skip_blank_lines; a row's byte range may end with them.
+    """
+    ends = [np.zeros(0, dtype=np.int64)]
+    after_cr = [np.zeros(0, dtype=bool)]
+    parity = 0
+    base = 0
+    last = 0
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(SCAN_CHUNK)
+            if not block:
+                break
+            data = np.frombuffer(block, dtype=np.uint8)
+            quotes = data == ord('"')
+            inside = (np.cumsum(quotes) + parity) & 1
+            newlines = np.flatnonzero((data == ord('\n')) & (inside == 0))
+            previous = np.where(newlines > 0, data[np.maximum(newlines - 1, 0)], last)
+            ends.append(newlines.astype(np.int64) + base + 1)
+            after_cr.append(previous == ord('\r'))
+            parity = (parity + int(quotes.sum())) & 1
+            base += len(block)
+            last = data[-1]
+
+    ends = np.concatenate(ends)
+    after_cr = np.concatenate(after_cr)
+    starts = np.concatenate(([0], ends[:-1])).astype(np.int64) if len(ends) else ends
+    length = ends - starts
+    blank = (length == 1) | ((length == 2) & after_cr)
+    offsets = np.append(starts[~blank], ends[-1] if len(ends) else 0)
+    if offsets[-1] != base:
+        # Last record without a trailing newline
+        offsets = np.append(offsets, base)
+    return offsets
+
+
+class CsvDataset:
+    """
+    One CSV file with its row index. `offsets[0]` is the header, data row
+    `i` spans bytes offsets[i + 1] .. offsets[i + 2].
+    """
+
+    def __init__(self, path, cache_dir=CACHE_DIR):
+        self.path = path
+        self.cache_dir = cache_dir
+        stat = os.stat(path)
+        self.signature = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        self._lock = threading.Lock()
+        self._stats = None
+        self.offsets = self._load_index()
+        with open(path, 'rb') as f:
+            f.seek(int(self.offsets[0]))
+            self.header = f.read(int(self.offsets[1] - self.offsets[0])) if len(self.offsets) > 1 else f.read()
+        self.columns = list(pd.read_csv(io.BytesIO(self.header), nrows=0).columns)
+
+    def _sidecar(self, suffix):
+        name = os.path.basename(self.path)
+        return os.path.join(self.cache_dir, f"{name}.{suffix}")
+
+    def _load_index(self):
+        index_path = self._sidecar('rows.npy')
+        meta_path = self._sidecar('meta.json')
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if meta.get("signature") == self.signature and meta.get("index_version") == INDEX_VERSION:
+                return np.load(index_path, mmap_mode='r')
+        except (OSError, ValueError):
+            pass
+
+        offsets = _row_offsets(self.path)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = index_path + '.tmp.npy'
+            np.save(tmp, offsets)
+            os.replace(tmp, index_path)
+            self._write_meta({"signature": self.signature, "index_version": INDEX_VERSION, "stats": {}})
+        except OSError as e:
+            print(f"Dataset Index Error: {e}")
+        return offsets
+
+    def _write_meta(self, meta):
+        meta_path = self._sidecar('meta.json')
+        tmp = meta_path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp, meta_path)
+
+    @property
+    def n_rows(self):
+        return max(len(self.offsets) - 2, 0)
+
+    def n_pages(self, page_size):
+        return max((self.n_rows + page_size - 1) // page_size, 1)
+
+    def read_rows(self, start, stop, columns=None):
+        """
+        Parses data rows [start, stop) and only the requested columns.
+        """
+        start = min(max(start, 0), self.n_rows)
+        stop = min(max(stop, start), self.n_rows)
+        if start == stop:
+            df = pd.read_csv(io.BytesIO(self.header), usecols=columns)
+        else:
+            begin, end = int(self.offsets[start + 1]), int(self.offsets[stop + 1])
+            with open(self.path, 'rb') as f:
+                f.seek(begin)
+                body = f.read(end - begin)
+            df = pd.read_csv(io.BytesIO(self.header + body), usecols=columns)
+        df.index = pd.RangeIndex(start, start + len(df))
+        return df
+
+    def page(self, number, page_size=100, columns=None):
+        """
+        Returns page `number` (0-based) as a DataFrame indexed by row number.
+        """
+        start = number * page_size
+        return self.read_rows(start, start + page_size, columns)
+
+    def column_stats(self, column):
+        """
+        Summary of one column, computed in a single chunked pass on first use
+        and cached next to the row index.
+        """
+        with self._lock:
+            if self._stats is None:
+                try:
+                    with open(self._sidecar('meta.json')) as f:
+                        meta = json.load(f)
+                    self._stats = meta["stats"] if meta.get("signature") == self.signature else {}
+                except (OSError, ValueError, KeyError):
+                    self._stats = {}
+            if column in self._stats:
+                return self._stats[column]
+
+        stats = self._compute_stats(column)
+        with self._lock:
+            self._stats[column] = stats
+            try:
+                self._write_meta({"signature": self.signature, "index_version": INDEX_VERSION,
+                                  "stats": self._stats})
+            except OSError as e:
+                print(f"Dataset Stats Error: {e}")
+        return stats
+
+    def _compute_stats(self, column):
+        count = missing = 0
+        numeric = True
+        total = 0.0
+        lo, hi = None, None
+        lengths = 0
+        values = Counter()
+        for chunk in pd.read_csv(self.path, usecols=[column], chunksize=STATS_CHUNK):
+            col = chunk[column]
+            present = col.dropna()
+            count += len(present)
+            missing += len(col) - len(present)
+            if numeric and pd.api.types.is_numeric_dtype(col):
+                if len(present):
+                    total += float(present.sum())
+                    lo = float(present.min()) if lo is None else min(lo, float(present.min()))
+                    hi = float(present.max()) if hi is None else max(hi, float(present.max()))
+            else:
+                numeric = False
+            text = present.map(str)
+            lengths += int(text.str.len().sum())
+            if values is not None:
+                values.update(text.value_counts().to_dict())
+                if len(values) > MAX_DISTINCT:
+                    values = None
+
+        stats = {"count": count, "missing": missing}
+        if numeric and count:
+            stats.update({"mean": total / count, "min": lo, "max": hi})
+        else:
+            stats["mean_length"] = lengths / count if count else 0.0
+        if values is not None:
+            stats["distinct"] = len(values)
+            stats["top"] = [[value, n] for value, n in values.most_common(5)]
+        else:
+            stats["distinct"] = f">{MAX_DISTINCT}"
+        return stats
+
+
+_datasets = {}
+_datasets_lock = threading.Lock()
+
+
+def get_dataset(path):
+    """
+    Returns the shared CsvDataset for `path`, rebuilt if the file changed.
+    """
+    stat = os.stat(path)
+    signature = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    dataset = _datasets.get(path)
+    if dataset is None or dataset.signature != signature:
+        with _datasets_lock:
+            dataset = _datasets.get(path)
+            if dataset is None or dataset.signature != signature:
+                dataset = CsvDataset(path)
+                _datasets[path] = dataset
+    return dataset
+
+
+# Benchmark: full parse vs. indexed page reads
+if __name__ == "__main__":
+    import argparse
+    import tempfile
+    import time
+
+    parser = argparse.ArgumentParser(description="Indexed page reads vs. full CSV parse")
+    parser.add_argument("path", nargs="?", help="CSV to page through (default: synthetic)")
+    parser.add_argument("--rows", type=int, default=500_000, help="rows in the synthetic file")
+    parser.add_argument("--page-size", type=int, default=500)
+    args = parser.parse_args()
+
+    tmp = None
+    path = args.path
+    if path is None:
+        tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(tmp.name, "synthetic.csv")
+        rng = np.random.default_rng(0)
+        words = np.array(["alone", "exam", "tired", "hopeless", "fine", "family", "sleep", "work"])
+        text = [" ".join(rng.choice(words, 12)) + ("\n\"quoted\" line" if i % 7 == 0 else "")
+                for i in range(args.rows)]
+        pd.DataFrame({"text": text, "class": rng.choice(["suicide", "non-suicide"], args.rows)}).to_csv(path)
+
+    start = time.perf_counter()
+    full = pd.read_csv(path)
+    full_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    dataset = CsvDataset(path, cache_dir=os.path.join(tmp.name, '.cache') if tmp else CACHE_DIR)
+    index_s = time.perf_counter() - start
+    assert dataset.n_rows == len(full)
+
+    last = dataset.n_pages(args.page_size) - 1
+    for number in (0, last // 2, last):
+        start = time.perf_counter()
+        page = dataset.page(number, args.page_size)
+        page_ms = (time.perf_counter() - start) * 1e3
+        expected = full.iloc[number * args.page_size:(number + 1) * args.page_size]
+        # dtypes are inferred per page (an int column may be float in the full file)
+        pd.testing.assert_frame_equal(page, expected, check_dtype=False)
+        print(f"page {number:>6}: {page_ms:7.2f} ms")
+
+    print(f"Full parse: {full_s * 1e3:.0f} ms per rerun | one-time index: {index_s * 1e3:.0f} ms "
+          f"| {dataset.n_rows} rows")
+    if tmp:
+        tmp.cleanup()
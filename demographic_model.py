@@ -0,0 +1,126 @@
+"""
+Demographic Risk Models
+Batch scoring for the RandomForest models from Predictive_Modeling.ipynb
+(depression and comorbidity risk level from survey demographics). Models
+and encoders are trained by `python train_models.py --demographic`.
+"""
+
+import copy
+import os
+
+import numpy as np
+import pandas as pd
+
+from feature_engineering import build_features, get_encoders
+from model_registry import get_registry
+
+DEP_MODEL = 'demographic_dep_rf.pkl'
+RISK_MODEL = 'demographic_risk_rf.pkl'
+
+# Feature sets as in the notebook; the risk model sees demographics only
+DEP_FEATURES = ['Gender_Encoded', 'Age', 'Course_Encoded', 'Year_Encoded', 'CGPA_Encoded',
+                'Marital_Bin', 'Anxiety_Bin', 'Panic_Bin']
+RISK_FEATURES = DEP_FEATURES[:6]
+
+RISK_LABELS = {0: "Low", 1: "Moderate", 2: "Significant", 3: "High"}
+
+
+class DemographicScorer:
+    """
+    Scores whole survey cohorts with the stored encoders and forests.
+    Tree evaluation runs in parallel (`n_jobs`, -1 = all cores).
+    """
+
+    def __init__(self, registry=None, n_jobs=-1):
+        self.registry = registry or get_registry()
+        self.n_jobs = n_jobs
+
+    @property
+    def available(self):
+        return all(os.path.exists(self.registry.path(name)) for name in (DEP_MODEL, RISK_MODEL))
+
+    def _model(self, name, n_jobs):
+        # Shallow copy: shares the fitted trees, only n_jobs differs per call
+        model = copy.copy(self.registry.get(name))
+        model.n_jobs = self.n_jobs if n_jobs is None else n_jobs
+        return model
+
+    def score_features(self, features, n_jobs=None):
+        """
+        Scores a frame from feature_engineering.build_features.
+        Returns one row per input row with the depression probability and
+        prediction, the predicted risk level and its probability.
+        """
+        dep_model = self._model(DEP_MODEL, n_jobs)
+        risk_model = self._model(RISK_MODEL, n_jobs)
+
+        dep_proba = dep_model.predict_proba(features[DEP_FEATURES])
+        dep_col = int(np.flatnonzero(dep_model.classes_ == 1)[0])
+        risk_proba = risk_model.predict_proba(features[RISK_FEATURES])
+        risk_idx = risk_proba.argmax(axis=1)
+        risk_codes = risk_model.classes_[risk_idx]
+
+        return pd.DataFrame({
+            "Depression_Prob": dep_proba[:, dep_col].astype(np.float32),
+            "Depression_Pred": (dep_proba[:, dep_col] > 0.5).astype(np.int8),
+            "Risk_Score_Pred": risk_codes.astype(np.int8),
+            "Risk_Level": pd.Categorical.from_codes(risk_codes.astype(np.int8), list(RISK_LABELS.values())),
+            "Risk_Prob": risk_proba[np.arange(len(risk_idx)), risk_idx].astype(np.float32),
+        }, index=features.index)
+
+    def score_frame(self, df, n_jobs=None):
+        """
+        Scores raw survey rows (the columns of Student Mental health.csv).
+        """
+        return self.score_features(build_features(df, get_encoders(registry=self.registry)), n_jobs)
+
+    def score_csv(self, path, n_jobs=None):
+        """
+        Scores a whole cohort file.
+        """
+        return self.score_frame(pd.read_csv(path), n_jobs)
+
+
+_scorer = None
+
+
+def get_scorer():
+    """
+    Returns the shared scorer for this process.
+    """
+    global _scorer
+    if _scorer is None:
+        _scorer = DemographicScorer()
+    return _scorer
+
+
+# Command line: score a cohort file
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Score a survey cohort with the demographic models")
+    parser.add_argument("path", nargs="?", default='Student Mental health.csv')
+    parser.add_argument("--out", help="write the scores as CSV")
+    parser.add_argument("--jobs", type=int, default=-1)
+    parser.add_argument("--repeat", type=int, default=1, help="replicate the cohort N times (benchmark)")
+    args = parser.parse_args()
+
+    scorer = get_scorer()
+    if not scorer.available:
+        raise SystemExit("No demographic models found; run `python train_models.py --demographic` first.")
+
+    cohort = pd.read_csv(args.path)
+    if args.repeat > 1:
+        cohort = pd.concat([cohort] * args.repeat, ignore_index=True)
+    for jobs in sorted({1, args.jobs}, key=lambda j: j == args.jobs):
+        start = time.perf_counter()
+        scores = scorer.score_frame(cohort, n_jobs=jobs)
+        elapsed = time.perf_counter() - start
+        print(f"n_jobs={jobs:>2}: {len(cohort)} rows in {elapsed:.2f} s ({len(cohort) / elapsed:,.0f} rows/s)")
+
+    print(scores["Risk_Level"].value_counts().to_string())
+    print(f"Predicted depression rate: {scores['Depression_Pred'].mean():.1%}")
+    if args.out:
+        cohort.join(scores).to_csv(args.out, index=False)
+        print(f"Scores written to {args.out}")
@@ -0,0 +1,214 @@
+"""
+Survey Feature Engineering
+The features from Feature_Engineering.ipynb / Predictive_Modeling.ipynb as an
+importable pipeline: a compact typed feature matrix (int8/float32 columns and
+categoricals), persisted encoders that are fitted once, and a feature cache
+keyed by the SHA-256 of the input file.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from model_registry import BASE_DIR, file_sha256, get_registry
+
+ENCODERS_PATH = 'survey_encoders.json'
+CACHE_DIR = os.path.join(BASE_DIR, '.cache')
+
+# Raw survey columns (Student Mental health.csv)
+COLUMNS = {
+    "gender": "Choose your gender",
+    "age": "Age",
+    "course": "What is your course?",
+    "year": "Your current year of Study",
+    "cgpa": "What is your CGPA?",
+    "marital": "Marital status",
+    "depression": "Do you have Depression?",
+    "anxiety": "Do you have Anxiety?",
+    "panic": "Do you have Panic attack?",
+    "specialist": "Did you seek any specialist for a treatment?",
+}
+
+# Label-encoded columns, named as in Predictive_Modeling.ipynb
+ENCODED = {"gender": "Gender", "course": "Course", "year": "Year", "cgpa": "CGPA"}
+
+BINARY = {
+    "depression": "Depression_Bin",
+    "anxiety": "Anxiety_Bin",
+    "panic": "Panic_Bin",
+    "specialist": "Specialist_Bin",
+    "marital": "Marital_Bin",
+}
+
+CGPA_WEIGHT = {
+    '0 - 1.99': 1,
+    '2.00 - 2.49': 2,
+    '2.50 - 2.99': 3,
+    '3.00 - 3.49': 4,
+    '3.50 - 4.00': 5,
+}
+
+
+class SurveyEncoders:
+    """
+    Fitted state of the pipeline: the sorted category list of each encoded
+    column (same codes as sklearn's LabelEncoder) and the Age fill value.
+    Categories unseen at fit time are encoded as -1.
+    """
+
+    def __init__(self, classes, age_median):
+        self.classes = classes
+        self.age_median = age_median
+        payload = json.dumps({"classes": classes, "age_median": age_median}, sort_keys=True)
+        self.fingerprint = hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+    @classmethod
+    def fit(cls, df):
+        classes = {
+            key: sorted(df[COLUMNS[key]].dropna().astype(str).unique().tolist())
+            for key in ENCODED
+        }
+        return cls(classes, float(df[COLUMNS["age"]].median()))
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            state = json.load(f)
+        return cls(state["classes"], state["age_median"])
+
+    def save(self, path):
+        tmp = path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({"classes": self.classes, "age_median": self.age_median}, f, indent=2)
+        os.replace(tmp, path)
+
+
+def _code_dtype(n_classes):
+    return np.int8 if n_classes < 127 else np.int16
+
+
+def build_features(df, encoders):
+    """
+    Returns the typed feature frame for a raw survey DataFrame.
+    Yes/No answers other than "Yes" (including missing) count as 0.
+    """
+    out = pd.DataFrame(index=df.index)
+    for key, name in ENCODED.items():
+        cat = pd.Categorical(df[COLUMNS[key]].astype(str).where(df[COLUMNS[key]].notna()),
+                             categories=encoders.classes[key])
+        out[name] = cat
+        out[f"{name}_Encoded"] = cat.codes.astype(_code_dtype(len(encoders.classes[key])))
+
+    out["Age"] = df[COLUMNS["age"]].fillna(encoders.age_median).astype(np.float32)
+
+    for key, name in BINARY.items():
+        out[name] = df[COLUMNS[key]].astype(str).str.strip().eq("Yes").astype(np.int8)
+
+    weight = df[COLUMNS["cgpa"]].astype(str).str.strip().map(CGPA_WEIGHT)
+    out["Academic_Pressure_Weight"] = weight.fillna(0).astype(np.int8)
+
+    dep, anx, panic, spec = (out[BINARY[k]] for k in ("depression", "anxiety", "panic", "specialist"))
+    # NaN where the CGPA band is unknown, as in the notebook
+    out["Stress_Score"] = ((anx + panic + (6 - weight)) / 3).astype(np.float32)
+    out["Depression_Level"] = (dep + dep * spec).astype(np.int8)
+    out["Anxiety_Level"] = (anx + anx * spec).astype(np.int8)
+    out["Sentiment_Score"] = (1.0 - (dep + anx + panic) / 3).astype(np.float32)
+    out["Risk_Score"] = (dep + anx + panic).astype(np.int8)
+    return out
+
+
+def get_encoders(path=ENCODERS_PATH, registry=None):
+    """
+    Returns the stored encoders (reloaded when the file changes). They are
+    only fitted by train_models.py --demographic.
+    """
+    registry = registry or get_registry()
+    if not os.path.exists(registry.path(path)):
+        raise FileNotFoundError(
+            f"No fitted survey encoders at {path}; run `python train_models.py --demographic` first."
+        )
+    return registry.get(path, loader=SurveyEncoders.load)
+
+
+def load_features(csv_path, encoders=None, cache_dir=CACHE_DIR):
+    """
+    Reads a survey CSV and returns its feature frame, reusing the cached
+    result when the same file was featurized with the same encoders before.
+    """
+    if encoders is None:
+        encoders = get_encoders()
+
+    digest = file_sha256(csv_path)
+    cache_path = os.path.join(cache_dir, f"features-{digest[:16]}-{encoders.fingerprint}.pkl")
+    if os.path.exists(cache_path):
+        return pd.read_pickle(cache_path)
+
+    features = build_features(pd.read_csv(csv_path), encoders)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = cache_path + '.tmp'
+        features.to_pickle(tmp)
+        os.replace(tmp, cache_path)
+    except OSError as e:
+        print(f"Feature Cache Error: {e}")
+    return features
+
+
+def _notebook_features(df):
+    # The original chained pandas ops, kept for the equivalence check below
+    from sklearn.preprocessing import LabelEncoder
+
+    df = df.copy()
+    binary_map = {'Yes': 1, 'No': 0}
+    df['Age'] = df['Age'].fillna(df['Age'].median())
+    df['Depression_Bin'] = df['Do you have Depression?'].map(binary_map)
+    df['Anxiety_Bin'] = df['Do you have Anxiety?'].map(binary_map)
+    df['Panic_Bin'] = df['Do you have Panic attack?'].map(binary_map)
+    df['Specialist_Bin'] = df['Did you seek any specialist for a treatment?'].map(binary_map)
+    df['Marital_Bin'] = df['Marital status'].map(binary_map)
+    df['Academic_Pressure_Weight'] = df['What is your CGPA?'].str.strip().map(CGPA_WEIGHT)
+    df['Stress_Score'] = (df['Anxiety_Bin'] + df['Panic_Bin'] + (6 - df['Academic_Pressure_Weight'])) / 3
+    df['Depression_Level'] = df['Depression_Bin'] + (df['Depression_Bin'] * df['Specialist_Bin'])
+    df['Anxiety_Level'] = df['Anxiety_Bin'] + (df['Anxiety_Bin'] * df['Specialist_Bin'])
+    df['Sentiment_Score'] = 1.0 - df[['Depression_Bin', 'Anxiety_Bin', 'Panic_Bin']].mean(axis=1)
+    le = LabelEncoder()
+    df['Gender_Encoded'] = le.fit_transform(df['Choose your gender'])
+    df['Course_Encoded'] = le.fit_transform(df['What is your course?'])
+    df['Year_Encoded'] = le.fit_transform(df['Your current year of Study'])
+    df['CGPA_Encoded'] = le.fit_transform(df['What is your CGPA?'])
+    return df
+
+
+# Demonstration: equivalence with the notebook, memory and cache timings
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    source = 'Student Mental health.csv'
+    raw = pd.read_csv(source)
+    notebook = _notebook_features(raw)
+    features = build_features(raw, SurveyEncoders.fit(raw))
+
+    checked = [c for c in features.columns if c in notebook.columns and features[c].dtype != 'category']
+    for col in checked:
+        assert np.allclose(features[col].astype(float), notebook[col].astype(float), equal_nan=True), col
+    print(f"{len(checked)} columns match the notebook")
+
+    # A larger synthetic cohort drawn from the survey rows
+    big = raw.sample(200_000, replace=True, random_state=0).reset_index(drop=True)
+    notebook_mb = _notebook_features(big).memory_usage(deep=True).sum() / 1e6
+    compact_mb = build_features(big, SurveyEncoders.fit(big)).memory_usage(deep=True).sum() / 1e6
+    print(f"{len(big)} rows: notebook frame {notebook_mb:.1f} MB | feature matrix {compact_mb:.1f} MB "
+          f"({notebook_mb / compact_mb:.1f}x smaller)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'cohort.csv')
+        big.to_csv(path, index=False)
+        encoders = SurveyEncoders.fit(big)
+        for label in ("cold", "cached"):
+            start = time.perf_counter()
+            load_features(path, encoders, cache_dir=tmp)
+            print(f"load_features ({label}): {(time.perf_counter() - start) * 1e3:.0f} ms")
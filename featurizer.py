@@ -0,0 +1,192 @@
+"""
+Fused TF-IDF Featurizer
+Tokenizes a journal once and produces the sparse TF-IDF vectors for several
+fitted vocabularies (multi-condition and suicide-risk) from that single pass.
+"""
+
+import re
+
+import numpy as np
+import scipy.sparse as sp
+
+# TfidfVectorizer settings the fused path reproduces exactly
+SUPPORTED_PARAMS = {
+    "analyzer": "word",
+    "binary": False,
+    "lowercase": True,
+    "ngram_range": (1, 1),
+    "norm": "l2",
+    "preprocessor": None,
+    "strip_accents": None,
+    "sublinear_tf": False,
+    "tokenizer": None,
+    "use_idf": True,
+}
+
+
+class FusedTfidfFeaturizer:
+    """
+    Maps every token into all vocabularies through one precomputed index.
+
+    Stop words never need to be removed explicitly: for unigram vectorizers
+    they were dropped at fit time, so they are simply absent from the index.
+
+    A vocabulary can have norm-only columns (a pruned model bundle): columns
+    at or past its `n_features` still count toward the L2 norm, exactly as
+    in the original vectorizer, but are left out of the output rows.
+    """
+
+    def __init__(self, token_pattern, vocabularies, idfs, dtype=np.float64):
+        # token -> column index in each vocabulary (-1 when absent)
+        index = {}
+        missing = (-1,) * len(vocabularies)
+        for k, vocab in enumerate(vocabularies):
+            for token, col in vocab.items():
+                cols = list(index.get(token, missing))
+                cols[k] = int(col)
+                index[token] = tuple(cols)
+        self._init(token_pattern, index, idfs, dtype)
+
+    def _init(self, token_pattern, index, idfs, dtype, n_features=None):
+        self.token_re = re.compile(token_pattern)
+        self.index = index
+        self.idfs = [np.asarray(idf, dtype=dtype) for idf in idfs]
+        self.n_features = list(n_features) if n_features else [len(idf) for idf in self.idfs]
+        self.dtype = dtype
+
+    @classmethod
+    def from_index(cls, token_pattern, tokens, columns, idfs, dtype=np.float64, n_features=None):
+        """
+        Builds the featurizer from a precomputed index: `tokens[i]` maps to
+        row `columns[i]` (one column per vocabulary, -1 when absent).
+        `n_features` gives the output width per vocabulary when trailing
+        columns are norm-only.
+        """
+        fused = cls.__new__(cls)
+        fused._init(token_pattern, dict(zip(tokens, map(tuple, columns.tolist()))), idfs, dtype, n_features)
+        return fused
+
+    @classmethod
+    def from_vectorizers(cls, *vectorizers):
+        """
+        Builds the featurizer from fitted TfidfVectorizers.
+        Raises ValueError if they do not share the supported preprocessing.
+        """
+        pattern = None
+        for vec in vectorizers:
+            if not hasattr(vec, "vocabulary_") or not hasattr(vec, "idf_"):
+                raise ValueError(f"{type(vec).__name__} has no fitted TF-IDF vocabulary")
+            params = vec.get_params()
+            for key, expected in SUPPORTED_PARAMS.items():
+                if params.get(key) != expected:
+                    raise ValueError(f"Unsupported TfidfVectorizer setting {key}={params.get(key)!r}")
+            if pattern is not None and params["token_pattern"] != pattern:
+                raise ValueError("Vectorizers use different token patterns")
+            pattern = params["token_pattern"]
+
+        return cls(
+            pattern,
+            [vec.vocabulary_ for vec in vectorizers],
+            [vec.idf_ for vec in vectorizers],
+            dtype=vectorizers[0].dtype,
+        )
+
+    def count_tokens(self, text):
+        """
+        Returns {token: count} for the tokens of `text` known to some vocabulary.
+        Counts of consecutive pieces of a text add up to the counts of the
+        whole text as long as no piece boundary falls inside a token.
+        """
+        counts = {}
+        index = self.index
+        for token in self.token_re.findall(text.lower()):
+            if token in index:
+                counts[token] = counts.get(token, 0) + 1
+        return counts
+
+    def _row(self, text):
+        return self._row_from_counts(self.count_tokens(text))
+
+    def _row_from_counts(self, counts):
+        index = self.index
+        rows = []
+        for k, (idf, n) in enumerate(zip(self.idfs, self.n_features)):
+            pairs = sorted((index[t][k], c) for t, c in counts.items() if index[t][k] >= 0)
+            cols = np.fromiter((p[0] for p in pairs), dtype=np.int32, count=len(pairs))
+            vals = np.fromiter((p[1] for p in pairs), dtype=self.dtype, count=len(pairs))
+            vals *= idf[cols]
+            norm = np.sqrt(np.dot(vals, vals))
+            if norm > 0:
+                vals /= norm
+            if n < len(idf):
+                # Norm-only columns sort last
+                end = np.searchsorted(cols, n)
+                cols, vals = cols[:end], vals[:end]
+            rows.append((cols, vals))
+        return rows
+
+    def transform_one(self, text):
+        """
+        Returns one 1-row CSR matrix per vocabulary for a single text.
+        """
+        return [
+            sp.csr_matrix((vals, cols, [0, len(cols)]), shape=(1, n))
+            for (cols, vals), n in zip(self._row(text), self.n_features)
+        ]
+
+    def transform(self, texts):
+        """
+        Returns one CSR matrix (len(texts) rows) per vocabulary.
+        """
+        return self._stack(self._row(text) for text in texts)
+
+    def transform_counts(self, counts_list):
+        """
+        Like transform(), from precomputed count_tokens() dictionaries.
+        """
+        return self._stack(self._row_from_counts(counts) for counts in counts_list)
+
+    def _stack(self, row_lists):
+        per_vocab = [([], [], [0]) for _ in self.idfs]
+        for rows in row_lists:
+            for (cols, vals), (indices, data, indptr) in zip(rows, per_vocab):
+                indices.append(cols)
+                data.append(vals)
+                indptr.append(indptr[-1] + len(cols))
+
+        matrices = []
+        for (indices, data, indptr), n in zip(per_vocab, self.n_features):
+            indices = np.concatenate(indices) if indices else np.empty(0, dtype=np.int32)
+            data = np.concatenate(data) if data else np.empty(0, dtype=self.dtype)
+            matrices.append(sp.csr_matrix((data, indices, indptr), shape=(len(indptr) - 1, n)))
+        return matrices
+
+
+# Demonstration
+if __name__ == "__main__":
+    import time
+    import joblib
+
+    multi_vec = joblib.load('multi_tfidf.pkl')
+    suicide_vec = joblib.load('tfidf_vectorizer.pkl')
+    fused = FusedTfidfFeaturizer.from_vectorizers(multi_vec, suicide_vec)
+
+    journal = ("I keep worrying about exams and I feel hopeless and alone. " * 40).strip()
+    a, b = fused.transform_one(journal)
+    assert np.allclose(a.toarray(), multi_vec.transform([journal]).toarray())
+    assert np.allclose(b.toarray(), suicide_vec.transform([journal]).toarray())
+
+    n = 300
+    start = time.perf_counter()
+    for _ in range(n):
+        multi_vec.transform([journal])
+        suicide_vec.transform([journal])
+    separate = (time.perf_counter() - start) / n
+
+    start = time.perf_counter()
+    for _ in range(n):
+        fused.transform_one(journal)
+    single = (time.perf_counter() - start) / n
+
+    print(f"Separate transforms: {separate * 1e3:.3f} ms/journal")
+    print(f"Fused transform:     {single * 1e3:.3f} ms/journal ({separate / single:.1f}x)")
@@ -0,0 +1,110 @@
+"""
+Wellness History Store
+Append-only per-user check-in log in users.db with daily and weekly rollups
+maintained incrementally on every insert, so trend views read O(days) rows.
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import auth
+
+PERIODS = ("day", "week")
+
+INSERT_CHECKIN = '''INSERT INTO checkins (username, created_at, pom_score, top_condition, is_emergency, ml_insights)
+                    VALUES (?, ?, ?, ?, ?, ?)'''
+UPSERT_ROLLUP = '''INSERT INTO checkin_rollups VALUES (?, ?, ?, 1, ?, ?)
+                   ON CONFLICT (username, period, bucket) DO UPDATE SET
+                   checkins = checkins + 1,
+                   pom_sum = pom_sum + excluded.pom_sum,
+                   emergencies = emergencies + excluded.emergencies'''
+UPSERT_CONDITION = '''INSERT INTO checkin_conditions VALUES (?, ?, ?, ?, 1)
+                      ON CONFLICT (username, period, bucket, condition) DO UPDATE SET
+                      checkins = checkins + 1'''
+SELECT_ROLLUPS = '''SELECT r.bucket, r.checkins, r.pom_sum / r.checkins, r.emergencies,
+                           (SELECT c.condition FROM checkin_conditions c
+                            WHERE c.username = r.username AND c.period = r.period AND c.bucket = r.bucket
+                            ORDER BY c.checkins DESC, c.condition LIMIT 1)
+                    FROM checkin_rollups r
+                    WHERE r.username = ? AND r.period = ? AND r.bucket >= ?
+                    ORDER BY r.bucket'''
+SELECT_RECENT = '''SELECT created_at, pom_score, top_condition, is_emergency, ml_insights
+                   FROM checkins WHERE username = ? ORDER BY id DESC LIMIT ?'''
+
+
+def _buckets(ts):
+    day = ts.date()
+    week = day - timedelta(days=day.weekday()) # ISO week, keyed by its Monday
+    return {"day": day.isoformat(), "week": week.isoformat()}
+
+
+class HistoryStore:
+    """
+    Records check-ins and keeps per-day/per-week aggregates (count, PoM
+    sum, emergency count, per-condition counts) in the same transaction.
+    """
+
+    def __init__(self, store=None):
+        self.store = store or auth.get_store()
+
+    def record(self, username, diag_result, situ_result, ts=None):
+        """
+        Appends one check-in built from the analyzer result dicts.
+        """
+        ts = ts or datetime.now()
+        insights = diag_result.get("ml_insights")
+        top_condition = insights[0][0] if insights else None
+        pom_score = int(situ_result["pom_score"])
+        is_emergency = int(bool(situ_result["is_emergency"]))
+        insights_json = json.dumps([[str(c), float(p)] for c, p in insights]) if insights else None
+
+        self.store.migrate()
+        with self.store.connection() as conn, conn:
+            conn.execute(INSERT_CHECKIN, (username, ts.isoformat(timespec="seconds"), pom_score,
+                                          top_condition and str(top_condition), is_emergency, insights_json))
+            for period, bucket in _buckets(ts).items():
+                conn.execute(UPSERT_ROLLUP, (username, period, bucket, pom_score, is_emergency))
+                if top_condition is not None:
+                    conn.execute(UPSERT_CONDITION, (username, period, bucket, str(top_condition)))
+
+    def rollups(self, username, period="day", since=None):
+        """
+        Returns the precomputed aggregates for `period` ("day" or "week"),
+        oldest first: bucket, checkins, mean_pom, emergencies, top_condition.
+        """
+        if period not in PERIODS:
+            raise ValueError(f"Unknown rollup period: {period}")
+        since = since.isoformat() if since is not None else ""
+        self.store.migrate()
+        with self.store.connection() as conn:
+            rows = conn.execute(SELECT_ROLLUPS, (username, period, since)).fetchall()
+        return [
+            {"bucket": b, "checkins": n, "mean_pom": mean, "emergencies": e, "top_condition": top}
+            for b, n, mean, e, top in rows
+        ]
+
+    def recent(self, username, limit=20):
+        """
+        Returns the latest raw check-ins, newest first.
+        """
+        self.store.migrate()
+        with self.store.connection() as conn:
+            rows = conn.execute(SELECT_RECENT, (username, limit)).fetchall()
+        return [
+            {"created_at": c, "pom_score": p, "top_condition": t, "is_emergency": bool(e),
+             "ml_insights": json.loads(i) if i else None}
+            for c, p, t, e, i in rows
+        ]
+
+
+_history = None
+
+
+def get_history():
+    """
+    Returns the shared history store for this process.
+    """
+    global _history
+    if _history is None:
+        _history = HistoryStore()
+    return _history
@@ -0,0 +1,245 @@
+"""
+Incremental Journal Analysis
+Sentence-level analysis for long, growing journals. Each sentence's rule
+hits and raw token counts are cached, so re-analysing an edited or
+appended journal only processes the new or changed sentences; document
+scores are rebuilt from running sums and equal logic.analyze_checkin on the
+full text. Every sentence also gets its own suicide-risk score, so the
+emergency check can stop at the first crisis sentence instead of letting it
+be diluted in the TF-IDF vector of a long entry.
+"""
+
+import math
+import re
+from collections import Counter
+
+import numpy as np
+
+import logic
+from metrics import timer
+
+# A sentence ends after . ! ? or a newline. The pieces concatenate back to the
+# text and every cut falls on a non-word character, so token counts and
+# marker hits of the pieces add up to those of the whole text (none of the
+# rule markers spans a sentence break).
+SENTENCE_RE = re.compile(r"[^.!?\n]+[.!?\n]*|[.!?\n]+")
+
+# A sentence alone raises an emergency only beyond the SVM margin
+# (decision > 1): short, mildly negative sentences often sit just above 0
+RISK_THRESHOLD = 1 / (1 + math.exp(-1))
+
+
+def split_sentences(text):
+    return SENTENCE_RE.findall(text)
+
+
+class Segment:
+    """
+    Cached analysis of one sentence.
+    """
+    __slots__ = ("text", "diag_markers", "situ_markers", "counts", "risk", "rule_emergency")
+
+    def __init__(self, text, diag_markers, situ_markers, counts):
+        self.text = text
+        self.diag_markers = diag_markers
+        self.situ_markers = situ_markers
+        self.counts = counts
+        self.risk = 0.0
+        self.rule_emergency = False
+
+
+class IncrementalAnalyzer:
+    """
+    Keeps the analysis of one evolving journal. update(text) diffs the new
+    sentence list against the previous one and applies only the added and
+    removed sentences to the running totals; analyze() scores the totals.
+    """
+
+    def __init__(self, diag=None, situ=None, risk_threshold=RISK_THRESHOLD, max_segments=10_000):
+        self.diag = diag or logic.DiagnosticAssistant()
+        self.situ = situ or logic.SituationalAnalyzer()
+        self.risk_threshold = risk_threshold
+        self.max_segments = max_segments
+        self.featurizer = None
+        if self.diag.has_ml and self.situ.has_ml:
+            try:
+                self.featurizer = logic.get_featurizer(self.diag.registry)
+            except Exception as e:
+                print(f"Incremental Featurizer Error: {e}")
+
+        situ_category = self.situ.RULES.marker_category
+        self._emergency_markers = {name for name, cat in situ_category.items() if cat == "emergency"}
+
+        self.text = ""
+        self._segments = {}
+        self._order = []
+        self._current = Counter()
+        self._token_counts = Counter()
+        self._diag_markers = Counter()
+        self._situ_markers = Counter()
+        self.stats = {"segments_scored": 0, "segments_reused": 0}
+
+    def _score(self, texts):
+        """
+        Analyzes new sentences in one batch: rule markers, token counts and
+        per-sentence suicide risk.
+        """
+        segments = []
+        for text in texts:
+            counts = self.featurizer.count_tokens(text) if self.featurizer is not None else {}
+            segment = Segment(text, self.diag.RULES.markers(text), self.situ.RULES.markers(text), counts)
+            segment.rule_emergency = bool(segment.situ_markers & self._emergency_markers)
+            segments.append(segment)
+
+        scored = [s for s in segments if s.counts]
+        if scored:
+            try:
+                X = self.featurizer.transform_counts([s.counts for s in scored])[1]
+                model = self.situ._model()
+                if hasattr(model, "predict_proba"):
+                    risk = model.predict_proba(X)[:, list(model.classes_).index(1)]
+                else:
+                    risk = 1 / (1 + np.exp(-model.decision_function(X)))
+                for segment, r in zip(scored, risk):
+                    segment.risk = float(r)
+            except Exception as e:
+                print(f"Sentence Risk Error: {e}")
+
+        for segment in segments:
+            self._segments[segment.text] = segment
+        self.stats["segments_scored"] += len(segments)
+        return segments
+
+    def _get(self, texts):
+        missing = [t for t in dict.fromkeys(texts) if t not in self._segments]
+        if missing:
+            with timer("incremental.score_sentences"):
+                self._score(missing)
+        self.stats["segments_reused"] += len(texts) - len(missing)
+        return [self._segments[t] for t in texts]
+
+    def _apply(self, segment, n):
+        # n > 0 adds the sentence n times to the running totals, n < 0 removes it
+        self._token_counts.update({t: c * n for t, c in segment.counts.items()})
+        self._diag_markers.update(dict.fromkeys(segment.diag_markers, n))
+        self._situ_markers.update(dict.fromkeys(segment.situ_markers, n))
+
+    def update(self, text):
+        """
+        Makes `text` the current journal, processing only changed sentences.
+        """
+        with timer("incremental.update"):
+            order = split_sentences(text)
+            new = Counter(order)
+            added = new - self._current
+            removed = self._current - new
+            self._get(list(added))
+
+            for seg_text, n in added.items():
+                self._apply(self._segments[seg_text], n)
+            for seg_text, n in removed.items():
+                self._apply(self._segments[seg_text], -n)
+            for totals in (self._token_counts, self._diag_markers, self._situ_markers):
+                for key in [k for k, v in totals.items() if v <= 0]:
+                    del totals[key]
+
+            self.text, self._order, self._current = text, order, new
+            if len(self._segments) > self.max_segments:
+                self._segments = {t: self._segments[t] for t in new}
+        return self
+
+    def _rule_counts(self, engine, markers):
+        counts = dict.fromkeys(engine.categories, 0)
+        for name in markers:
+            counts[engine.marker_category[name]] += 1
+        return counts
+
+    def analyze(self):
+        """
+        Returns (diagnostic_result, situational_result) for the current
+        journal, equal to logic.analyze_checkin(text, cache=False).
+        """
+        multi_X = suicide_X = None
+        if self.featurizer is not None and self.text.strip():
+            multi_X, suicide_X = self.featurizer.transform_counts([dict(self._token_counts)])
+        diag_counts = self._rule_counts(self.diag.RULES, self._diag_markers)
+        situ_counts = self._rule_counts(self.situ.RULES, self._situ_markers)
+        return (
+            self.diag.analyze_batch([self.text], X=multi_X, rule_counts=[diag_counts])[0],
+            self.situ.analyze_batch([self.text], X=suicide_X, rule_counts=[situ_counts])[0],
+        )
+
+    def sentences(self):
+        """
+        Per-sentence risk of the current journal, in order.
+        """
+        return [
+            {
+                "text": segment.text.strip(),
+                "risk": round(segment.risk, 2),
+                "is_emergency": segment.rule_emergency or segment.risk > self.risk_threshold,
+            }
+            for segment in (self._segments[t] for t in self._order)
+        ]
+
+    def emergency_check(self, text):
+        """
+        Returns {"is_emergency", "sentence", "reason"} for `text`, stopping at
+        the first sentence that hits an emergency marker or crosses the risk
+        threshold. Only when no sentence does is the whole journal scored
+        (its document-level model prediction can still flag it).
+        """
+        with timer("incremental.emergency_check"):
+            for seg_text in split_sentences(text):
+                segment = self._get([seg_text])[0]
+                if segment.rule_emergency or segment.risk > self.risk_threshold:
+                    reason = "marker" if segment.rule_emergency else "sentence_risk"
+                    return {"is_emergency": True, "sentence": segment.text.strip(), "reason": reason}
+
+            situ_result = self.update(text).analyze()[1]
+            return {
+                "is_emergency": situ_result["is_emergency"],
+                "sentence": None,
+                "reason": "document" if situ_result["is_emergency"] else None,
+            }
+
+
+# Demonstration: a journal written sentence by sentence
+if __name__ == "__main__":
+    import time
+    from benchmark import NEGATIVE, NEUTRAL
+
+    rng = np.random.default_rng(3)
+    sentences = []
+    for i in range(400):
+        words = list(rng.choice(NEUTRAL + NEGATIVE, rng.integers(8, 25)))
+        sentences.append(" ".join(words).capitalize() + rng.choice([". ", "! ", "?\n", ".\n"]))
+
+    diag, situ = logic.DiagnosticAssistant(), logic.SituationalAnalyzer()
+    inc = IncrementalAnalyzer(diag, situ)
+    full_s = inc_s = 0.0
+    text = ""
+    for i, sentence in enumerate(sentences):
+        text += sentence
+        start = time.perf_counter()
+        expected = logic.analyze_checkin(text, diag, situ, cache=False)
+        full_s += time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = inc.update(text).analyze()
+        inc_s += time.perf_counter() - start
+        assert result == expected, f"mismatch after sentence {i}"
+
+    # Edit a sentence in the middle: only that one is re-scored
+    edited = text.replace(sentences[200], "Nobody noticed how alone I felt today. ")
+    assert inc.update(edited).analyze() == logic.analyze_checkin(edited, diag, situ, cache=False)
+
+    print(f"{len(sentences)} appends ({len(text.split())} words at the end): "
+          f"full re-analysis {full_s * 1e3:.0f} ms | incremental {inc_s * 1e3:.0f} ms ({full_s / inc_s:.1f}x)")
+    print(f"Sentences scored {inc.stats['segments_scored']}, reused {inc.stats['segments_reused']}")
+
+    crisis = edited + "I can't do this anymore, I want to end it. "
+    start = time.perf_counter()
+    check = inc.emergency_check(crisis)
+    print(f"Emergency check after appending a crisis sentence: {check} "
+          f"in {(time.perf_counter() - start) * 1e3:.2f} ms")
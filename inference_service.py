@@ -0,0 +1,232 @@
+"""
+Local Inference Service
+Asyncio front-end for logic.py that micro-batches concurrent check-ins so
+many dashboard sessions share one featurization and model pass.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import logic
+
+
+class ServiceOverloaded(Exception):
+    """Raised when the request queue is full."""
+
+
+class ServiceStopped(Exception):
+    """Raised for requests submitted to, or still queued in, a stopped service."""
+
+
+class _Request:
+    __slots__ = ("text", "future", "deadline")
+
+    def __init__(self, text, future, deadline):
+        self.text = text
+        self.future = future
+        self.deadline = deadline
+
+
+class InferenceService:
+    """
+    Collects requests for up to `max_wait` seconds (or `max_batch` items),
+    runs them as one logic.analyze_checkin_batch call on a thread pool and
+    resolves each caller's future.
+
+    At most `max_queue` requests may wait; beyond that `analyze` raises
+    ServiceOverloaded instead of queueing unbounded work. Requests whose
+    deadline passed while queued are failed without being scored.
+    """
+
+    def __init__(self, max_batch=32, max_wait=0.005, max_queue=256, workers=2,
+                 analyze_batch=logic.analyze_checkin_batch):
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+        self.workers = workers
+        self.analyze_batch = analyze_batch
+        self.batches = 0
+        self.rejected = 0
+        self.expired = 0
+        self._queue = None
+        self._executor = None
+        self._slots = None
+        self._task = None
+        self._inflight = set()
+
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="inference")
+        self._slots = asyncio.Semaphore(self.workers)
+        self._task = asyncio.create_task(self._batcher())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._queue is not None:
+            # Fail what never reached a batch instead of leaving callers to time out
+            queue, self._queue = self._queue, None
+            while not queue.empty():
+                request = queue.get_nowait()
+                if not request.future.done():
+                    request.future.set_exception(ServiceStopped("inference service stopped"))
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    @property
+    def queue_depth(self):
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def analyze(self, text, timeout=None):
+        """
+        Returns (diagnostic_result, situational_result) for one journal.
+        Raises ServiceOverloaded if the queue is full, ServiceStopped if the
+        service is stopped and asyncio.TimeoutError if no result arrives
+        within `timeout` seconds.
+        """
+        if self._queue is None:
+            raise ServiceStopped("inference service is not running")
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout is not None else None
+        request = _Request(text, loop.create_future(), deadline)
+        try:
+            self._queue.put_nowait(request)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise ServiceOverloaded(f"{self.max_queue} requests already queued")
+
+        if timeout is None:
+            return await request.future
+        return await asyncio.wait_for(request.future, timeout)
+
+    async def _batcher(self):
+        loop = asyncio.get_running_loop()
+        batch = []
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                window_end = loop.time() + self.max_wait
+                while len(batch) < self.max_batch:
+                    remaining = window_end - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+
+                now = loop.time()
+                live = []
+                for request in batch:
+                    if request.future.done():
+                        continue
+                    if request.deadline is not None and request.deadline <= now:
+                        self.expired += 1
+                        request.future.set_exception(asyncio.TimeoutError())
+                    else:
+                        live.append(request)
+
+                if live:
+                    # Bound in-flight batches to the pool size
+                    await self._slots.acquire()
+                    task = asyncio.create_task(self._run(live))
+                    self._inflight.add(task)
+                    task.add_done_callback(self._inflight.discard)
+                batch = []
+        except asyncio.CancelledError:
+            # Stopped while holding a batch that never got a worker slot
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(ServiceStopped("inference service stopped"))
+            raise
+
+    async def _run(self, batch):
+        loop = asyncio.get_running_loop()
+        try:
+            texts = [request.text for request in batch]
+            diag_results, situ_results = await loop.run_in_executor(
+                self._executor, self.analyze_batch, texts)
+            self.batches += 1
+            for request, d, s in zip(batch, diag_results, situ_results):
+                if not request.future.done():
+                    request.future.set_result((d, s))
+        except Exception as e:
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+        finally:
+            self._slots.release()
+
+
+class BackgroundService:
+    """
+    Runs an InferenceService on its own event loop thread so synchronous
+    callers (the Streamlit script) can submit work and block on the result.
+    """
+
+    def __init__(self, **kwargs):
+        self.service = InferenceService(**kwargs)
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="inference-loop", daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self.service.start(), self.loop).result()
+
+    def analyze(self, text, timeout=10.0):
+        """
+        Blocks for the result. Raises ServiceOverloaded, ServiceStopped or
+        TimeoutError (after `timeout` seconds).
+        """
+        future = asyncio.run_coroutine_threadsafe(self.service.analyze(text, timeout), self.loop)
+        try:
+            return future.result()
+        except asyncio.TimeoutError as e:
+            # Same class as the builtin from Python 3.11 on; normalized for older versions
+            raise TimeoutError(f"no result within {timeout} s") from e
+
+    def close(self):
+        asyncio.run_coroutine_threadsafe(self.service.stop(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_service():
+    """
+    Returns the process-wide background service, starting it on first use.
+    """
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = BackgroundService()
+    return _service
+
+
+# Demonstration: many concurrent sessions sharing batches
+if __name__ == "__main__":
+    import time
+
+    async def demo():
+        logic.analyze_checkin("warm up the shared models", cache=False)
+        service = InferenceService()
+        await service.start()
+        journals = [f"Session {i}: I feel worried about exams and a bit alone." for i in range(200)]
+        start = time.perf_counter()
+        results = await asyncio.gather(*(service.analyze(j, timeout=5.0) for j in journals))
+        elapsed = time.perf_counter() - start
+        await service.stop()
+        print(f"{len(results)} requests in {elapsed * 1e3:.1f} ms using {service.batches} batches")
+
+    asyncio.run(demo())
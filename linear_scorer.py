@@ -0,0 +1,116 @@
+"""
+Sparse Linear Scorer
+Array-backed replacement for LinearSVC.decision_function on TF-IDF rows,
+without sklearn's per-call input validation.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+
+
+class SparseLinearScorer:
+    """
+    Holds a linear model as a term-index -> per-class weight table.
+
+    `weights` is stored term-major and C-contiguous (n_features x n_classes),
+    so scoring a CSR row only touches the weight rows of its nonzero terms.
+    Quantized tables hold int8 weights plus one float scale per class.
+    """
+
+    def __init__(self, coef, intercept, classes):
+        coef = np.asarray(coef, dtype=np.float64)
+        self.weights = np.ascontiguousarray(coef.T)
+        self.intercept = np.asarray(intercept, dtype=np.float64)
+        self.classes_ = np.asarray(classes)
+        self.binary = coef.shape[0] == 1
+        self.scale = None
+
+    @classmethod
+    def from_arrays(cls, weights, intercept, classes, scale=None):
+        """
+        Wraps an existing term-major weight table without copying it, so a
+        memory-mapped array stays shared between processes. `scale` holds
+        the per-class factors of an int8 table (weight = q * scale).
+        """
+        scorer = cls.__new__(cls)
+        scorer.weights = weights
+        scorer.intercept = np.asarray(intercept, dtype=np.float64)
+        scorer.classes_ = np.asarray(classes)
+        scorer.binary = weights.shape[1] == 1
+        scorer.scale = None
+        if scale is not None:
+            # Plain ndarray view of the (still shared) mapping: cheaper to fancy-index
+            scorer.weights = np.asarray(weights)
+            scorer.scale = np.asarray(scale, dtype=np.float64)
+        return scorer
+
+    @classmethod
+    def from_model(cls, model):
+        """
+        Exports coef_/intercept_/classes_ from a fitted linear classifier.
+        """
+        coef = model.coef_
+        if hasattr(coef, "toarray"):
+            coef = coef.toarray()
+        return cls(coef, model.intercept_, model.classes_)
+
+    @property
+    def n_features(self):
+        return self.weights.shape[0]
+
+    def decision_function(self, X):
+        """
+        Scores a CSR matrix; same output shape as sklearn's decision_function.
+        """
+        if self.scale is None:
+            scores = np.asarray(X @ self.weights, dtype=np.float64)
+        else:
+            # Upcast only the int8 rows of the nonzero terms, not the whole table
+            if not sp.isspmatrix_csr(X):
+                X = sp.csr_matrix(X)
+            scores = np.zeros((X.shape[0], self.weights.shape[1]))
+            if X.nnz:
+                terms = self.weights[X.indices] * X.data[:, None].astype(np.float64)
+                starts = X.indptr[:-1]
+                filled = starts < X.indptr[1:]
+                scores[filled] = np.add.reduceat(terms, starts[filled], axis=0)
+            scores *= self.scale
+        scores += self.intercept
+        return scores.ravel() if self.binary else scores
+
+    def predict(self, X):
+        scores = self.decision_function(X)
+        if self.binary:
+            return self.classes_[(scores > 0).astype(int)]
+        return self.classes_[scores.argmax(axis=1)]
+
+
+# Microbenchmark against sklearn's decision_function on single journals
+if __name__ == "__main__":
+    import time
+    import joblib
+    from featurizer import FusedTfidfFeaturizer
+
+    multi_vec = joblib.load('multi_tfidf.pkl')
+    suicide_vec = joblib.load('tfidf_vectorizer.pkl')
+    fused = FusedTfidfFeaturizer.from_vectorizers(multi_vec, suicide_vec)
+    journal = "I keep worrying about exams, I feel hopeless and alone and nobody seems to notice."
+    rows = fused.transform_one(journal)
+
+    for name, X in (('multi_svm_model.pkl', rows[0]), ('suicide_svm_model.pkl', rows[1])):
+        model = joblib.load(name)
+        scorer = SparseLinearScorer.from_model(model)
+        assert np.allclose(scorer.decision_function(X), model.decision_function(X), rtol=0, atol=1e-12)
+
+        n = 5000
+        start = time.perf_counter()
+        for _ in range(n):
+            model.decision_function(X)
+        sk_us = (time.perf_counter() - start) * 1e6 / n
+
+        start = time.perf_counter()
+        for _ in range(n):
+            scorer.decision_function(X)
+        fast_us = (time.perf_counter() - start) * 1e6 / n
+
+        print(f"{name}: sklearn {sk_us:7.1f} us | sparse scorer {fast_us:6.1f} us ({sk_us / fast_us:.0f}x)")
@@ -1,108 +1,543 @@
-import re
-import joblib
 import os
+import json
+import time
 import numpy as np
 from datetime import datetime
+from model_registry import get_registry
+from featurizer import FusedTfidfFeaturizer
+from rules import RuleEngine
+from linear_scorer import SparseLinearScorer
+from calibration import Calibration
+from result_cache import get_result_cache, make_key
+from metrics import timer
 
 # Path Configuration
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# Model Artifacts
+MULTI_MODEL = 'multi_svm_model.pkl'
+MULTI_VEC = 'multi_tfidf.pkl'
+SUICIDE_MODEL = 'suicide_svm_model.pkl'
+SUICIDE_VEC = 'tfidf_vectorizer.pkl'
+
+# Lookup-table calibration fitted by `train_models.py` (optional)
+CALIBRATION = 'calibration.json'
+
+# Compact bundle exported by `train_models.py --export-bundle`; preferred when present
+BUNDLE_MANIFEST = os.path.join('model_bundle', 'manifest.json')
+# Format 2 adds optional vocabulary pruning and int8 weights with per-class scales;
+# format 3 keeps pruned terms as norm-only columns past each model's n_features
+BUNDLE_FORMAT = 3
+
+class ModelBundle:
+    """
+    Both models loaded from the compact bundle: a fused featurizer over the
+    shared vocabulary and one sparse scorer per model. Numeric arrays are
+    memory-mapped, so worker processes share their pages.
+    """
+    def __init__(self, manifest, featurizer, multi_scorer, suicide_scorer):
+        self.manifest = manifest
+        self.featurizer = featurizer
+        self.multi_scorer = multi_scorer
+        self.suicide_scorer = suicide_scorer
+
+def load_bundle(manifest_path, mmap_mode='r'):
+    """Loads a model bundle from its manifest.json (see train_models.export_bundle)."""
+    bundle_dir = os.path.dirname(manifest_path)
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    if manifest.get('format') not in (1, 2, BUNDLE_FORMAT):
+        raise ValueError(f"Unsupported model bundle format: {manifest.get('format')}")
+    if manifest['format'] == 2 and manifest.get('prune'):
+        # Format 2 dropped pruned terms from the TF-IDF norm, which shifts every score
+        raise ValueError("Pruned format 2 model bundle; re-export it with `train_models.py --compress`")
+
+    def array(name):
+        if name not in manifest['arrays']:
+            return None
+        return np.load(os.path.join(bundle_dir, manifest['arrays'][name]), mmap_mode=mmap_mode)
+
+    # Vocabulary: UTF-8 blob + offsets, decoded once into the token index
+    blob = array('vocab_blob').tobytes()
+    offsets = array('vocab_offsets').tolist()
+    tokens = [blob[a:b].decode('utf-8') for a, b in zip(offsets[:-1], offsets[1:])]
+
+    dtype = np.dtype(manifest['dtype'])
+    n_features = manifest.get('n_features')
+    featurizer = FusedTfidfFeaturizer.from_index(
+        manifest['token_pattern'], tokens, array('columns'),
+        [array('multi_idf'), array('suicide_idf')], dtype=dtype,
+        n_features=[n_features['multi'], n_features['suicide']] if n_features else None)
+    # int8 weight tables stay memory-mapped; their scales are applied per call
+    multi_scorer = SparseLinearScorer.from_arrays(
+        array('multi_weights'), array('multi_intercept'), manifest['multi_classes'],
+        scale=array('multi_weight_scale'))
+    suicide_scorer = SparseLinearScorer.from_arrays(
+        array('suicide_weights'), array('suicide_intercept'), manifest['suicide_classes'],
+        scale=array('suicide_weight_scale'))
+    return ModelBundle(manifest, featurizer, multi_scorer, suicide_scorer)
+
+_stale_bundles = set()
+
+def _stale_sources(bundle, registry):
+    """Source pickles whose current content differs from what the bundle was exported from."""
+    stale = []
+    for name, digest in bundle.manifest.get('sources', {}).items():
+        # A deployment may ship the bundle without its pickles
+        if os.path.exists(registry.path(name)) and registry.fingerprint(name) != digest:
+            stale.append(name)
+    return stale
+
+def get_bundle(registry=None):
+    """
+    Returns the shared model bundle, or None when none has been exported or
+    the pickles were retrained after the export (they are served instead).
+    """
+    registry = registry or get_registry()
+    if not os.path.exists(registry.path(BUNDLE_MANIFEST)):
+        return None
+    bundle = registry.get(BUNDLE_MANIFEST, loader=load_bundle)
+    stale = _stale_sources(bundle, registry)
+    if stale:
+        version = bundle.manifest.get('version', bundle.manifest['created'])
+        if version not in _stale_bundles:
+            _stale_bundles.add(version)
+            print(f"Model bundle is stale ({', '.join(stale)} changed since export); using the pickles. "
+                  f"Re-run `train_models.py --export-bundle`.")
+        return None
+    return bundle
+
+# Artifacts behind each model's decision scores
+MODEL_SOURCES = {'multi': (MULTI_VEC, MULTI_MODEL), 'suicide': (SUICIDE_VEC, SUICIDE_MODEL)}
+
+def _serving_sources(model, registry):
+    """
+    Hashes of the pickles whose scores `model` ('multi' or 'suicide') is
+    serving right now, or None when it serves a pruned or int8 bundle.
+    """
+    bundle = get_bundle(registry)
+    if bundle is None:
+        try:
+            return {name: registry.fingerprint(name) for name in MODEL_SOURCES[model]}
+        except OSError:
+            return dict.fromkeys(MODEL_SOURCES[model])
+    manifest = bundle.manifest
+    prune, weights = manifest.get('prune', 0), manifest.get('weights', 'float')
+    if model == 'suicide':
+        prune, weights = manifest.get('suicide_prune', prune), manifest.get('suicide_weights', weights)
+    if prune or weights != 'float':
+        return None
+    return {name: manifest.get('sources', {}).get(name) for name in MODEL_SOURCES[model]}
+
+_skipped_calibrations = set()
+
+def get_calibration(registry=None, model=None):
+    """
+    Returns the shared score calibration, or None when none has been fitted.
+    With `model` ('multi' or 'suicide'), also None unless the tables were
+    fitted on the scores of exactly the model serving it.
+    """
+    registry = registry or get_registry()
+    if not os.path.exists(registry.path(CALIBRATION)):
+        return None
+    calibration = registry.get(CALIBRATION, loader=Calibration.load)
+    if model is None:
+        return calibration
+    fitted = calibration.info.get('models', {})
+    serving = _serving_sources(model, registry)
+    if serving is None:
+        # Recalibrating cannot help: tables are always fitted on the pickles' scores
+        reason = (f"the served model bundle has pruned or int8 {model} weights; "
+                  f"re-export it uncompressed with `train_models.py --export-bundle` to use calibration")
+    elif any(fitted.get(name) != digest for name, digest in serving.items()):
+        reason = (f"it was fitted for other {model} model files than those serving; "
+                  f"re-run `train_models.py --calibrate`")
+    else:
+        return calibration
+    key = (registry.version(CALIBRATION, loader=Calibration.load), model)
+    if key not in _skipped_calibrations:
+        _skipped_calibrations.add(key)
+        print(f"Calibration not applied to the {model} model ({reason}); using softmax/sigmoid scores.")
+    return None
+    return calibration
+
 class DiagnosticAssistant:
-    def __init__(self):
-        # Load Multi-Condition ML Model
+    # Legend for Rule-based
+    CATEGORIES = {
+        "Anxiety Disorders": [r"\bworr(y|ied|ying)\b", r"\banxious\b", r"\banxiety\b", r"\bpanic\b", r"\bfraid\b", r"\bfear\b"],
+        "Mood Disorders": [r"\bdepress\w*\b", r"\bsad\w*\b", r"\bhopeless\w*\b", r"\bworthless\w*\b", r"\banhedonia\b"],
+        "Stress & Trauma": [r"\btrauma\b", r"\bflashback\b", r"\bnightmare\b", r"\bstress\b", r"\boverwhelmed\b"]
+    }
+    RULES = RuleEngine(CATEGORIES)
+
+    def __init__(self, registry=None):
+        # Load Multi-Condition ML Model (shared across instances via the registry)
+        self.registry = registry or get_registry()
         try:
-            self.multi_model = joblib.load(os.path.join(BASE_DIR, 'multi_svm_model.pkl'))
-            self.multi_vec = joblib.load(os.path.join(BASE_DIR, 'multi_tfidf.pkl'))
+            if get_bundle(self.registry) is None:
+                self.registry.get(MULTI_MODEL)
+                self.registry.get(MULTI_VEC)
             self.has_ml = True
         except Exception as e:
             print(f"ML Load Error (Multi): {e}")
             self.has_ml = False
 
-        # Legend for Rule-based
-        self.CATEGORIES = {
-            "Anxiety Disorders": [r"\bworr(y|ied|ying)\b", r"\banxious\b", r"\banxiety\b", r"\bpanic\b", r"\bfraid\b", r"\bfear\b"],
-            "Mood Disorders": [r"\bdepress\w*\b", r"\bsad\w*\b", r"\bhopeless\w*\b", r"\bworthless\w*\b", r"\banhedonia\b"],
-            "Stress & Trauma": [r"\btrauma\b", r"\bflashback\b", r"\bnightmare\b", r"\bstress\b", r"\boverwhelmed\b"]
-        }
+    @property
+    def multi_model(self):
+        return self.registry.get(MULTI_MODEL)
+
+    @property
+    def multi_vec(self):
+        return self.registry.get(MULTI_VEC)
+
+    def _featurize(self, texts):
+        bundle = get_bundle(self.registry)
+        if bundle is not None:
+            return bundle.featurizer.transform(texts)[0]
+        return self.multi_vec.transform(texts)
+
+    def _model(self):
+        bundle = get_bundle(self.registry)
+        if bundle is not None:
+            return bundle.multi_scorer
+        return get_scorer(MULTI_MODEL, self.registry) or self.multi_model
 
-    def analyze(self, text):
+    def analyze(self, text, vec=None):
+        return self.analyze_batch([text], X=vec)[0]
+
+    def analyze_batch(self, texts, X=None, rule_counts=None):
+        """
+        Analyzes many journals at once. `X` optionally holds their precomputed
+        multi-condition TF-IDF rows and `rule_counts` their RULES.scan()
+        results. Each result equals analyze() on that text.
+        """
         # 1. Rule-based analysis
-        results = {}
-        for cat, markers in self.CATEGORIES.items():
-            count = sum(1 for m in markers if re.search(m, text, re.IGNORECASE))
-            results[cat] = min(count * 20, 100)
-        
-        # 2. ML Inference (if available)
-        ml_insights = None
-        if self.has_ml and text.strip():
+        all_results = []
+        with timer("diagnostic.rules"):
+            if rule_counts is None:
+                rule_counts = [self.RULES.scan(text) for text in texts]
+            for counts in rule_counts:
+                all_results.append({cat: min(count * 20, 100) for cat, count in counts.items()})
+
+        # 2. ML Inference (if available), one decision_function for the whole batch
+        all_insights = [None] * len(texts)
+        rows = [i for i, text in enumerate(texts) if text.strip()]
+        if self.has_ml and rows:
             try:
-                vec = self.multi_vec.transform([text])
+                if X is None:
+                    with timer("diagnostic.featurize"):
+                        X = self._featurize([texts[i] for i in rows])
+                elif len(rows) < len(texts):
+                    X = X[rows]
                 # For SVM, we use decision_function for probability proxy
-                d_func = self.multi_model.decision_function(vec)[0]
-                exp_d = np.exp(d_func - np.max(d_func))
-                probs = exp_d / exp_d.sum()
-                
-                classes = self.multi_model.classes_
-                prob_map = list(zip(classes, probs))
-                prob_map.sort(key=lambda x: x[1], reverse=True)
-                ml_insights = prob_map
+                model = self._model()
+                with timer("diagnostic.decision_function"):
+                    d_func = model.decision_function(X)
+                classes = model.classes_
+                calibration = get_calibration(self.registry, 'multi')
+                if calibration is not None and calibration.multi_classes == classes.tolist():
+                    probs = calibration.multi_probs(d_func)
+                else:
+                    exp_d = np.exp(d_func - np.max(d_func, axis=1, keepdims=True))
+                    probs = exp_d / exp_d.sum(axis=1, keepdims=True)
+
+                for i, row in zip(rows, probs):
+                    prob_map = list(zip(classes, row))
+                    prob_map.sort(key=lambda x: x[1], reverse=True)
+                    all_insights[i] = prob_map
             except Exception as e:
                 print(f"ML Inference Error: {e}")
 
-        return {
-            "rule_based": results,
-            "ml_insights": ml_insights
-        }
+        return [
+            {
+                "rule_based": results,
+                "ml_insights": ml_insights
+            }
+            for results, ml_insights in zip(all_results, all_insights)
+        ]
 
 class SituationalAnalyzer:
-    def __init__(self):
-        # Load Suicide Risk ML Model
+    # Emergency phrases and the negative markers behind the simple PoM score
+    RULES = RuleEngine({
+        "emergency": [r"\bdone with life\b", r"\bend it\b", r"\bhopeless\b"],
+        "negative": [r"\bnobody\b", r"\balone\b", r"\bfailing\b", r"\bhate\b", r"\bworried\b"]
+    })
+
+    def __init__(self, registry=None):
+        # Load Suicide Risk ML Model (shared across instances via the registry)
+        self.registry = registry or get_registry()
         try:
-            self.suicide_model = joblib.load(os.path.join(BASE_DIR, 'suicide_svm_model.pkl'))
-            self.suicide_vec = joblib.load(os.path.join(BASE_DIR, 'tfidf_vectorizer.pkl'))
+            if get_bundle(self.registry) is None:
+                self.registry.get(SUICIDE_MODEL)
+                self.registry.get(SUICIDE_VEC)
             self.has_ml = True
         except Exception as e:
             print(f"ML Load Error (Suicide): {e}")
             self.has_ml = False
 
-    def analyze(self, text):
-        # 1. Rule-based Emergency Check
-        is_emergency_rule = bool(re.search(r"\bdone with life\b|\bend it\b|\bhopeless\b", text, re.IGNORECASE))
-        
-        # 2. ML Suicide Risk Prediction
-        is_high_risk_ml = False
-        confidence = 0.0
-        
-        if self.has_ml and text.strip():
+    @property
+    def suicide_model(self):
+        return self.registry.get(SUICIDE_MODEL)
+
+    @property
+    def suicide_vec(self):
+        return self.registry.get(SUICIDE_VEC)
+
+    def _featurize(self, texts):
+        bundle = get_bundle(self.registry)
+        if bundle is not None:
+            return bundle.featurizer.transform(texts)[1]
+        return self.suicide_vec.transform(texts)
+
+    def _model(self):
+        bundle = get_bundle(self.registry)
+        if bundle is not None:
+            return bundle.suicide_scorer
+        model = self.suicide_model
+        if hasattr(model, "predict_proba"):
+            return model
+        return get_scorer(SUICIDE_MODEL, self.registry) or model
+
+    def analyze(self, text, vec=None):
+        return self.analyze_batch([text], X=vec)[0]
+
+    def analyze_batch(self, texts, X=None, rule_counts=None):
+        """
+        Analyzes many journals at once. `X` optionally holds their precomputed
+        suicide-risk TF-IDF rows and `rule_counts` their RULES.scan()
+        results. Each result equals analyze() on that text.
+        """
+        # 1. Rule-based Emergency Check (one scan per text also yields the PoM markers)
+        if rule_counts is None:
+            with timer("situational.rules"):
+                rule_counts = [self.RULES.scan(text) for text in texts]
+
+        # 2. ML Suicide Risk Prediction, one model pass for the whole batch
+        is_high_risk_ml, confidence = self._ml_risk(texts, X)
+
+        return [
+            self._result(counts, ml_hit, conf)
+            for counts, ml_hit, conf in zip(rule_counts, is_high_risk_ml, confidence)
+        ]
+
+    def _ml_risk(self, texts, X=None):
+        """
+        Returns ([is_high_risk_ml], confidence array) from one model pass.
+        """
+        is_high_risk_ml = [False] * len(texts)
+        confidence = np.zeros(len(texts))
+
+        rows = [i for i, text in enumerate(texts) if text.strip()]
+        if self.has_ml and rows:
             try:
-                vec = self.suicide_vec.transform([text])
-                prediction = self.suicide_model.predict(vec)[0]
+                if X is None:
+                    with timer("situational.featurize"):
+                        X = self._featurize([texts[i] for i in rows])
+                elif len(rows) < len(texts):
+                    X = X[rows]
+                model = self._model()
                 # SVM doesn't always have predict_proba, use decision_function if needed
-                if hasattr(self.suicide_model, "predict_proba"):
-                    probs = self.suicide_model.predict_proba(vec)[0]
-                    confidence = probs[1] if prediction == 1 else probs[0]
+                if hasattr(model, "predict_proba"):
+                    with timer("situational.predict_proba"):
+                        prediction = model.predict(X)
+                        probs = model.predict_proba(X)
+                    conf = np.where(prediction == 1, probs[:, 1], probs[:, 0])
                 else:
-                    d_func = self.suicide_model.decision_function(vec)[0]
-                    confidence = 1 / (1 + np.exp(-d_func)) # Sigmoid for confidence proxy
-                
-                is_high_risk_ml = (prediction == 1)
+                    with timer("situational.decision_function"):
+                        d_func = model.decision_function(X)
+                    # Same rule as LinearSVC.predict, without a second model pass
+                    prediction = model.classes_[(d_func > 0).astype(int)]
+                    calibration = get_calibration(self.registry, 'suicide')
+                    if calibration is not None:
+                        conf = calibration.suicide_probs(d_func) # Calibrated P(risk)
+                    else:
+                        conf = 1 / (1 + np.exp(-d_func)) # Sigmoid for confidence proxy
+
+                for i, pred, c in zip(rows, prediction, conf):
+                    is_high_risk_ml[i] = (pred == 1)
+                    confidence[i] = c
             except Exception as e:
                 print(f"ML Suicide Prediction Error: {e}")
+        return is_high_risk_ml, confidence
 
+    @staticmethod
+    def _result(counts, ml_hit, conf):
         # Combine logic
-        is_emergency = is_emergency_rule or is_high_risk_ml
-        
-        # Simple PoM score 
-        neg_markers = [r"\bnobody\b", r"\balone\b", r"\bfailing\b", r"\bhate\b", r"\bworried\b"]
-        neg_count = sum(1 for m in neg_markers if re.search(m, text, re.IGNORECASE))
+        is_emergency = counts["emergency"] > 0 or ml_hit
+
+        # Simple PoM score
+        neg_count = counts["negative"]
         pom_score = max(100 - (neg_count * 25), 0)
-        
+
         if is_emergency:
             pom_score = min(pom_score, 10)
 
         return {
             "pom_score": pom_score,
             "is_emergency": is_emergency,
-            "is_ml_risk": is_high_risk_ml,
-            "ml_confidence": round(float(confidence), 2)
+            "is_ml_risk": ml_hit,
+            "ml_confidence": round(float(conf), 2)
         }
+
+    def triage(self, text, X=None, max_tier="model"):
+        """
+        Tiered crisis check for the emergency banner; see SituationalTriage.
+        """
+        return SituationalTriage(self, text, X, max_tier)
+
+# Latency budget for deciding whether to show the emergency banner
+EMERGENCY_BUDGET_MS = 50
+
+class SituationalTriage:
+    """
+    Tiered evaluation of one journal, cheapest tier first:
+    - "rules": one compiled scan; an emergency phrase decides immediately
+    - "model": one decision_function call gives prediction and confidence
+    - "pom": the Peace of Mind score, only computed by result()
+    `is_emergency` is final once set; it stays None when `max_tier="rules"`
+    and no phrase matched. result() runs any skipped tiers and returns the
+    same dict as SituationalAnalyzer.analyze(text).
+    """
+    def __init__(self, analyzer, text, X=None, max_tier="model"):
+        self.analyzer = analyzer
+        self.text = text
+        self._X = X
+        self.timings = {}
+        self.is_ml_risk = None
+        self.ml_confidence = None
+
+        self.counts = self._timed("rules", lambda: analyzer.RULES.scan(text))
+        self.tier = "rules"
+        self.is_emergency = True if self.counts["emergency"] > 0 else None
+        if self.is_emergency is None and max_tier == "model":
+            self._run_model()
+            self.is_emergency = self.is_ml_risk
+            self.tier = "model"
+
+    def _timed(self, name, fn):
+        start = time.perf_counter()
+        with timer(f"situational.tier.{name}"):
+            value = fn()
+        self.timings[name] = (time.perf_counter() - start) * 1e3
+        return value
+
+    def _run_model(self):
+        hits, conf = self._timed("model", lambda: self.analyzer._ml_risk([self.text], self._X))
+        self.is_ml_risk, self.ml_confidence = hits[0], conf[0]
+
+    @property
+    def decision_ms(self):
+        """Time spent before is_emergency was decided."""
+        return sum(ms for tier, ms in self.timings.items() if tier != "pom")
+
+    @property
+    def within_budget(self):
+        return self.decision_ms <= EMERGENCY_BUDGET_MS
+
+    def result(self):
+        if self.is_ml_risk is None:
+            self._run_model()
+        return self._timed("pom", lambda: self.analyzer._result(self.counts, self.is_ml_risk, self.ml_confidence))
+
+STRESSOR_RULES = RuleEngine({
+    "Academic": [r"work", r"study", r"grade", r"exam", r"assignment"],
+    "Social": [r"friend", r"lonely", r"argument", r"relationship", r"people"],
+    "Financial": [r"money", r"debt", r"broke", r"pay", r"bills"]
+})
+
+def detect_stressors(text):
+    """Returns the situational stressor categories mentioned in `text`."""
+    with timer("stressors.rules"):
+        return STRESSOR_RULES.matched_categories(text)
+
+def _build_featurizer(multi_vec, suicide_vec):
+    try:
+        return FusedTfidfFeaturizer.from_vectorizers(multi_vec, suicide_vec)
+    except ValueError as e:
+        print(f"Fused TF-IDF unavailable, using separate transforms: {e}")
+        return None
+
+def _build_scorer(model):
+    if not hasattr(model, "coef_"):
+        return None
+    return SparseLinearScorer.from_model(model)
+
+def get_scorer(name, registry=None):
+    """Returns the sparse fast-path scorer for a linear model artifact (None if not linear)."""
+    registry = registry or get_registry()
+    return registry.derived(f'scorer:{name}', (name,), _build_scorer)
+
+def get_featurizer(registry=None):
+    """Returns the shared featurizer for both vocabularies (None if unsupported)."""
+    registry = registry or get_registry()
+    bundle = get_bundle(registry)
+    if bundle is not None:
+        return bundle.featurizer
+    return registry.derived('fused_tfidf', (MULTI_VEC, SUICIDE_VEC), _build_featurizer)
+
+def model_versions(registry=None):
+    """
+    Versions of everything a check-in result depends on: the rule sets, the
+    calibration tables if they apply to a serving model, and the content
+    hash of each model artifact (None when one is missing).
+    """
+    registry = registry or get_registry()
+    versions = [DiagnosticAssistant.RULES.fingerprint, SituationalAnalyzer.RULES.fingerprint]
+    if get_calibration(registry, 'multi') is not None or get_calibration(registry, 'suicide') is not None:
+        versions.append(registry.version(CALIBRATION, loader=Calibration.load))
+    if get_bundle(registry) is not None:
+        versions.append(registry.version(BUNDLE_MANIFEST, loader=load_bundle))
+        return tuple(versions)
+    for name in (MULTI_MODEL, MULTI_VEC, SUICIDE_MODEL, SUICIDE_VEC):
+        try:
+            versions.append(registry.version(name))
+        except OSError:
+            versions.append(None)
+    return tuple(versions)
+
+def analyze_checkin(text, diag=None, situ=None, cache=None):
+    """
+    Runs both analyzers on one journal, tokenizing it only once for the two
+    TF-IDF vocabularies. Returns (diagnostic_result, situational_result).
+    """
+    diag_results, situ_results = analyze_checkin_batch([text], diag, situ, cache)
+    return diag_results[0], situ_results[0]
+
+def analyze_checkin_batch(texts, diag=None, situ=None, cache=None):
+    """
+    Batch version of analyze_checkin: one featurization pass and one model
+    call per classifier for all texts not already in the result cache.
+    Pass cache=False to bypass the shared cache. Returns two lists of result dicts.
+    """
+    diag = diag or DiagnosticAssistant()
+    situ = situ or SituationalAnalyzer()
+    if cache is None:
+        cache = get_result_cache()
+    if cache is False:
+        return _run_checkin_batch(texts, diag, situ)
+
+    versions = model_versions(diag.registry)
+    keys = [make_key(text, versions) for text in texts]
+    results = [cache.get(key) for key in keys]
+
+    misses = [i for i, cached in enumerate(results) if cached is None]
+    if misses:
+        diag_results, situ_results = _run_checkin_batch([texts[i] for i in misses], diag, situ)
+        for i, d, s in zip(misses, diag_results, situ_results):
+            cache.put(keys[i], (d, s))
+            results[i] = (d, s)
+
+    return [r[0] for r in results], [r[1] for r in results]
+
+def _run_checkin_batch(texts, diag, situ):
+    multi_X = suicide_X = None
+    if diag.has_ml and situ.has_ml and any(text.strip() for text in texts):
+        try:
+            fused = get_featurizer(diag.registry)
+            if fused is not None:
+                with timer("checkin.featurize"):
+                    multi_X, suicide_X = fused.transform(texts)
+        except Exception as e:
+            print(f"Fused Featurization Error: {e}")
+
+    return diag.analyze_batch(texts, X=multi_X), situ.analyze_batch(texts, X=suicide_X)
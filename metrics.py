@@ -0,0 +1,327 @@
+"""
+Metrics
+Lightweight in-process instrumentation: stage timers (context manager or
+decorator) feeding log-bucketed latency histograms, plain counters, and
+collectors that pull existing stats (result cache, model registry) on
+export. Exposed as Prometheus text on an optional local HTTP endpoint and
+on the app's hidden admin page. Set MH_METRICS=0 to turn timers off.
+"""
+
+import bisect
+import functools
+import os
+import re
+import threading
+import time
+
+ENABLED = os.environ.get("MH_METRICS", "1") != "0"
+
+# Histogram bucket upper bounds: 1 us .. ~270 s, four per power of two, so a
+# reported percentile is within ~10% of the true value
+BOUNDS = [1e-6 * 2 ** (k / 4) for k in range(113)]
+QUANTILES = (0.5, 0.95, 0.99)
+
+PREFIX = "mh_"
+
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram; observe() is one bisect and a locked
+    increment, so it can stay on in production.
+    """
+
+    def __init__(self):
+        self.counts = [0] * (len(BOUNDS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        i = bisect.bisect_left(BOUNDS, seconds)
+        with self._lock:
+            self.counts[i] += 1
+            self.count += 1
+            self.sum += seconds
+
+    def quantile(self, q):
+        """
+        Returns the q-quantile in seconds (bucket midpoint), or None if empty.
+        """
+        with self._lock:
+            counts, total = list(self.counts), self.count
+        if not total:
+            return None
+        rank = max(q * total, 1)
+        seen = 0
+        for i, c in enumerate(counts):
+            seen += c
+            if seen >= rank:
+                break
+        if i == 0:
+            return BOUNDS[0]
+        if i == len(BOUNDS):
+            return BOUNDS[-1]
+        return (BOUNDS[i - 1] * BOUNDS[i]) ** 0.5
+
+
+class Timer:
+    """
+    Times one `with` block into a histogram.
+    """
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def _metric_name(name):
+    return PREFIX + re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+class Metrics:
+    """
+    Registry of per-stage histograms, counters and stats collectors.
+    Stages are free-form dotted names such as "diagnostic.decision_function".
+    """
+
+    def __init__(self, enabled=ENABLED):
+        self.enabled = enabled
+        self._histograms = {}
+        self._counters = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def histogram(self, stage):
+        hist = self._histograms.get(stage)
+        if hist is None:
+            with self._lock:
+                hist = self._histograms.setdefault(stage, Histogram())
+        return hist
+
+    def timer(self, stage):
+        """
+        Context manager timing its block as `stage`.
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return Timer(self.histogram(stage))
+
+    def timed(self, stage):
+        """
+        Decorator timing every call of the wrapped function as `stage`.
+        """
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.histogram(stage).observe(time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def observe(self, stage, seconds):
+        if self.enabled:
+            self.histogram(stage).observe(seconds)
+
+    def inc(self, name, n=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def add_collector(self, collector):
+        """
+        Registers a callable returning {name: number}, read on every export.
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def _collected(self):
+        values = {}
+        for collector in list(self._collectors):
+            try:
+                values.update(collector())
+            except Exception as e:
+                print(f"Metrics Collector Error: {e}")
+        return values
+
+    def snapshot(self):
+        """
+        Returns {"stages": {stage: {count, mean, p50, p95, p99}}, "counters",
+        "collected"} with latencies in seconds.
+        """
+        stages = {}
+        for stage, hist in sorted(self._histograms.items()):
+            if not hist.count:
+                continue
+            summary = {"count": hist.count, "mean": hist.sum / hist.count}
+            for q in QUANTILES:
+                summary[f"p{int(q * 100)}"] = hist.quantile(q)
+            stages[stage] = summary
+        with self._lock:
+            counters = dict(self._counters)
+        return {"stages": stages, "counters": counters, "collected": self._collected()}
+
+    def prometheus(self):
+        """
+        Renders everything in the Prometheus text exposition format.
+        """
+        lines = [
+            f"# HELP {PREFIX}stage_seconds Latency of instrumented stages.",
+            f"# TYPE {PREFIX}stage_seconds histogram",
+        ]
+        for stage, hist in sorted(self._histograms.items()):
+            with hist._lock:
+                counts, total, sum_ = list(hist.counts), hist.count, hist.sum
+            cumulative = 0
+            for i, bound in enumerate(BOUNDS):
+                cumulative += counts[i]
+                # Export every power of two; the finer buckets only feed quantiles
+                if i % 4 == 0:
+                    lines.append(f'{PREFIX}stage_seconds_bucket{{stage="{stage}",le="{bound:.6g}"}} {cumulative}')
+            lines.append(f'{PREFIX}stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {total}')
+            lines.append(f'{PREFIX}stage_seconds_sum{{stage="{stage}"}} {sum_:.9f}')
+            lines.append(f'{PREFIX}stage_seconds_count{{stage="{stage}"}} {total}')
+
+        lines.append(f"# TYPE {PREFIX}stage_quantile_seconds gauge")
+        for stage, hist in sorted(self._histograms.items()):
+            for q in QUANTILES:
+                value = hist.quantile(q)
+                if value is not None:
+                    lines.append(f'{PREFIX}stage_quantile_seconds{{stage="{stage}",quantile="{q}"}} {value:.9f}')
+
+        with self._lock:
+            counters = sorted(self._counters.items())
+        for name, value in counters:
+            metric = _metric_name(name) + "_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        for name, value in sorted(self._collected().items()):
+            metric = _metric_name(name)
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {float(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def serve(port=9108, host="127.0.0.1", metrics=None):
+    """
+    Starts a daemon HTTP server exposing GET /metrics. Returns the server.
+    """
+    # Imported here: http.server costs ~25 ms and most processes never serve
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    metrics = metrics or get_metrics()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics():
+    """
+    Returns the shared metrics for this process. If MH_METRICS_PORT is set,
+    the first call also starts the local /metrics endpoint on that port.
+    """
+    global _metrics
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                metrics = Metrics()
+                port = os.environ.get("MH_METRICS_PORT")
+                if port:
+                    try:
+                        serve(int(port), metrics=metrics)
+                    except OSError as e:
+                        print(f"Metrics Endpoint Error: {e}")
+                _metrics = metrics
+    return _metrics
+
+
+def timer(stage):
+    return get_metrics().timer(stage)
+
+
+def timed(stage):
+    """
+    Decorator form of timer(); resolves the shared metrics at call time.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with get_metrics().timer(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def observe(stage, seconds):
+    get_metrics().observe(stage, seconds)
+
+
+def inc(name, n=1):
+    get_metrics().inc(name, n)
+
+
+# Overhead check and sample output
+if __name__ == "__main__":
+    metrics = Metrics()
+    n = 200_000
+
+    start = time.perf_counter()
+    for _ in range(n):
+        pass
+    base = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(n):
+        with metrics.timer("noop"):
+            pass
+    timed_s = time.perf_counter() - start
+    print(f"timer overhead: {(timed_s - base) * 1e9 / n:.0f} ns per block")
+
+    for ms in (1, 2, 5, 10, 50):
+        for _ in range(20):
+            metrics.observe("sample", ms / 1e3)
+    summary = metrics.snapshot()["stages"]["sample"]
+    print({k: round(v * 1e3, 2) if k != "count" else v for k, v in summary.items()}, "(ms)")
+    print("\n".join(metrics.prometheus().splitlines()[-8:]))
@@ -0,0 +1,189 @@
+"""
+Process-wide Model Registry
+Loads each model artifact once per process and shares the warm instance
+between the Streamlit app, the analyzers in logic.py and any batch callers.
+"""
+
+import hashlib
+import os
+import threading
+import time
+
+import joblib
+
+import metrics
+
+# Path Configuration
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class ArtifactEntry:
+    """
+    A loaded artifact together with the file fingerprint it was loaded from.
+    """
+
+    def __init__(self, value, mtime_ns, size, sha256, load_seconds):
+        self.value = value
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.sha256 = sha256
+        self.load_seconds = load_seconds
+        self.loaded_at = time.time()
+        self.checked_at = time.monotonic()
+        self.loads = 1
+
+
+class ModelRegistry:
+    """
+    Thread-safe cache of model artifacts keyed by file name.
+
+    Each artifact is loaded once and re-used until its file changes on disk.
+    A cheap stat (mtime + size) runs at most once every `check_interval`
+    seconds; only when that changes is the file re-hashed, and only when the
+    hash changes is it unpickled again.
+    """
+
+    def __init__(self, base_dir=BASE_DIR, loader=joblib.load, check_interval=1.0):
+        self.base_dir = base_dir
+        self.loader = loader
+        self.check_interval = check_interval
+        self._entries = {}
+        self._derived = {}
+        self._fingerprints = {}
+        self._lock = threading.RLock()
+
+    def path(self, name):
+        return os.path.join(self.base_dir, name)
+
+    def get(self, name, loader=None):
+        """
+        Returns the loaded artifact for `name`, loading or reloading it if needed.
+        `loader` overrides the registry's default loader for this artifact.
+        """
+        entry = self._entries.get(name)
+        if entry is not None and time.monotonic() - entry.checked_at < self.check_interval:
+            return entry.value
+
+        with self._lock:
+            return self._refresh(name, loader or self.loader).value
+
+    def version(self, name, loader=None):
+        """
+        Returns the SHA-256 of the artifact file currently loaded for `name`.
+        """
+        self.get(name, loader)
+        return self._entries[name].sha256
+
+    def fingerprint(self, name):
+        """
+        Returns the SHA-256 of the file for `name` without loading it. Like
+        get(), it stats at most every `check_interval` seconds and only
+        re-hashes when mtime or size changed.
+        """
+        cached = self._fingerprints.get(name)
+        now = time.monotonic()
+        if cached is not None and now - cached[3] < self.check_interval:
+            return cached[2]
+        st = os.stat(self.path(name))
+        if cached is not None and (st.st_mtime_ns, st.st_size) == cached[:2]:
+            digest = cached[2]
+        else:
+            digest = file_sha256(self.path(name))
+        self._fingerprints[name] = (st.st_mtime_ns, st.st_size, digest, now)
+        return digest
+
+    def derived(self, name, deps, builder):
+        """
+        Returns an object built from other artifacts, e.g. a featurizer that
+        combines two vectorizers. It is rebuilt whenever one of `deps` changes.
+        """
+        versions = tuple(self.version(dep) for dep in deps)
+        cached = self._derived.get(name)
+        if cached is not None and cached[0] == versions:
+            return cached[1]
+
+        with self._lock:
+            cached = self._derived.get(name)
+            if cached is None or cached[0] != versions:
+                value = builder(*(self.get(dep) for dep in deps))
+                cached = (versions, value)
+                self._derived[name] = cached
+            return cached[1]
+
+    def stats(self):
+        """
+        Returns load timings and fingerprints for every artifact loaded so far.
+        """
+        with self._lock:
+            return {
+                name: {
+                    "load_seconds": round(entry.load_seconds, 6),
+                    "loads": entry.loads,
+                    "loaded_at": entry.loaded_at,
+                    "sha256": entry.sha256,
+                    "size": entry.size,
+                }
+                for name, entry in self._entries.items()
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._derived.clear()
+            self._fingerprints.clear()
+
+    def _refresh(self, name, loader):
+        path = self.path(name)
+        st = os.stat(path)
+        entry = self._entries.get(name)
+
+        if entry is not None:
+            entry.checked_at = time.monotonic()
+            if (st.st_mtime_ns, st.st_size) == (entry.mtime_ns, entry.size):
+                return entry
+            # File was touched: only reload if the content actually changed
+            digest = file_sha256(path)
+            if digest == entry.sha256:
+                entry.mtime_ns, entry.size = st.st_mtime_ns, st.st_size
+                return entry
+        else:
+            digest = file_sha256(path)
+
+        start = time.perf_counter()
+        value = loader(path)
+        elapsed = time.perf_counter() - start
+        metrics.observe("registry.load", elapsed)
+        metrics.inc("model_loads")
+
+        new_entry = ArtifactEntry(value, st.st_mtime_ns, st.st_size, digest, elapsed)
+        if entry is not None:
+            new_entry.loads = entry.loads + 1
+        self._entries[name] = new_entry
+        return new_entry
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """
+    Returns the shared registry for this process.
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry()
+                metrics.get_metrics().add_collector(lambda: {
+                    f"registry_loads_{name}": entry["loads"] for name, entry in _registry.stats().items()
+                })
+    return _registry
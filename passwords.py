@@ -0,0 +1,191 @@
+"""
+Password Hashing
+Versioned, tunable KDF hashes (scrypt / PBKDF2 from hashlib) computed on a
+small bounded worker pool, with support for the legacy SHA-256 format.
+
+Stored formats (the salt lives in its own column):
+- scrypt$n=16384,r=8,p=1$<hex digest>
+- pbkdf2_sha256$i=600000$<hex digest>
+- <64 hex chars>  (legacy single SHA-256 of password + salt)
+"""
+
+import hashlib
+import hmac
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Current cost settings; hashes made with anything else are upgraded on login
+SETTINGS = {
+    "scheme": "scrypt",
+    "scrypt": {"n": 2 ** 14, "r": 8, "p": 1},
+    "pbkdf2_sha256": {"i": 600_000},
+    "workers": 2,
+}
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def configure(scheme=None, workers=None, **params):
+    """
+    Changes the active scheme, its cost parameters or the KDF pool size,
+    e.g. configure(scheme="scrypt", n=2**15) or configure(workers=4).
+    """
+    global _pool
+    if scheme is not None:
+        if scheme not in ("scrypt", "pbkdf2_sha256"):
+            raise ValueError(f"Unknown password scheme: {scheme}")
+        SETTINGS["scheme"] = scheme
+    if params:
+        SETTINGS[SETTINGS["scheme"]].update(params)
+    if workers is not None and workers != SETTINGS["workers"]:
+        with _pool_lock:
+            SETTINGS["workers"] = workers
+            old, _pool = _pool, None
+        if old is not None:
+            old.shutdown(wait=False)
+
+
+def _kdf_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(max_workers=SETTINGS["workers"], thread_name_prefix="kdf")
+    return _pool
+
+
+def _derive(password, salt, scheme, params):
+    if scheme == "scrypt":
+        n, r, p = params["n"], params["r"], params["p"]
+        return hashlib.scrypt(password.encode(), salt=salt.encode(), n=n, r=r, p=p,
+                              maxmem=256 * n * r + (1 << 20), dklen=32).hex()
+    if scheme == "pbkdf2_sha256":
+        return hashlib.pbkdf2_hmac("sha256", password.encode(), salt.encode(), params["i"]).hex()
+    raise ValueError(f"Unknown password scheme: {scheme}")
+
+
+def _format(scheme, params, digest):
+    encoded = ",".join(f"{k}={v}" for k, v in params.items())
+    return f"{scheme}${encoded}${digest}"
+
+
+def _parse(stored):
+    scheme, encoded, digest = stored.split("$")
+    params = {k: int(v) for k, v in (item.split("=") for item in encoded.split(","))}
+    return scheme, params, digest
+
+
+def legacy_hash(password, salt):
+    """The original single SHA-256 of password + salt."""
+    return hashlib.sha256((password + salt).encode()).hexdigest()
+
+
+def hash_password(password, salt):
+    """
+    Hashes with the current scheme and cost on the KDF pool (blocks the caller).
+    """
+    scheme = SETTINGS["scheme"]
+    params = dict(SETTINGS[scheme])
+    digest = _kdf_pool().submit(_derive, password, salt, scheme, params).result()
+    return _format(scheme, params, digest)
+
+
+def dummy_hash():
+    """
+    A hash with the current scheme and cost that no password matches. Verifying
+    against it costs as much as a real login (used for unknown usernames).
+    """
+    scheme = SETTINGS["scheme"]
+    return _format(scheme, SETTINGS[scheme], "0" * 64)
+
+
+def _spend_kdf(password, salt):
+    # One KDF at the current cost, so checks that need none take as long as a real one
+    scheme = SETTINGS["scheme"]
+    _kdf_pool().submit(_derive, password, salt or "", scheme, dict(SETTINGS[scheme])).result()
+
+
+def needs_rehash(stored):
+    """
+    True for legacy hashes and for hashes made with other scheme/cost settings.
+    """
+    if not stored or "$" not in stored:
+        return True
+    try:
+        scheme, params, _ = _parse(stored)
+    except ValueError:
+        return True
+    return scheme != SETTINGS["scheme"] or params != SETTINGS[scheme]
+
+
+def verify_password(password, salt, stored):
+    """
+    Checks `password` against any supported stored format in constant time.
+    A missing or malformed stored hash never matches. Every outcome costs at
+    least one current-cost KDF, so timing does not tell legacy, broken or
+    unknown accounts apart from current ones.
+    """
+    if not stored:
+        _spend_kdf(password, salt)
+        return False
+    if "$" not in stored:
+        _spend_kdf(password, salt)
+        return hmac.compare_digest(legacy_hash(password, salt), stored)
+    try:
+        scheme, params, digest = _parse(stored)
+        candidate = _kdf_pool().submit(_derive, password, salt, scheme, params).result()
+    except (ValueError, KeyError) as e:
+        print(f"Password Hash Error: {e}")
+        _spend_kdf(password, salt)
+        return False
+    return hmac.compare_digest(candidate, digest)
+
+
+# Calibration: pick the cost that fits a target login latency on this machine
+if __name__ == "__main__":
+    import argparse
+    import time
+    from concurrent.futures import ThreadPoolExecutor as Clients
+
+    parser = argparse.ArgumentParser(description="Calibrate KDF cost for a target login latency")
+    parser.add_argument("--target-ms", type=float, default=50.0)
+    parser.add_argument("--logins", type=int, default=32, help="concurrent logins for the burst test")
+    args = parser.parse_args()
+
+    def timed(scheme, params, repeat=3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            _derive("correct horse battery staple", "0" * 32, scheme, params)
+        return (time.perf_counter() - start) * 1e3 / repeat
+
+    print(f"Target single-hash latency: {args.target_ms:.0f} ms")
+    best = {}
+    for log_n in range(12, 19):
+        params = {"n": 2 ** log_n, "r": 8, "p": 1}
+        ms = timed("scrypt", params)
+        print(f"  scrypt n=2^{log_n:<2} r=8 p=1  {ms:8.1f} ms")
+        if ms <= args.target_ms:
+            best["scrypt"] = params
+        elif ms > 4 * args.target_ms:
+            break
+    for iterations in (100_000, 200_000, 400_000, 600_000, 1_000_000):
+        params = {"i": iterations}
+        ms = timed("pbkdf2_sha256", params)
+        print(f"  pbkdf2_sha256 i={iterations:<9} {ms:8.1f} ms")
+        if ms <= args.target_ms:
+            best["pbkdf2_sha256"] = params
+        elif ms > 4 * args.target_ms:
+            break
+    for scheme, params in best.items():
+        print(f"Recommended {scheme}: {params}")
+
+    # Burst test: how long a wave of logins waits behind the bounded pool
+    scheme = SETTINGS["scheme"]
+    stored = _format(scheme, SETTINGS[scheme], _derive("pw", "salt", scheme, SETTINGS[scheme]))
+    start = time.perf_counter()
+    with Clients(max_workers=args.logins) as clients:
+        list(clients.map(lambda _: verify_password("pw", "salt", stored), range(args.logins)))
+    elapsed = time.perf_counter() - start
+    print(f"{args.logins} concurrent logins with {SETTINGS['workers']} KDF workers: "
+          f"{elapsed * 1e3:.0f} ms total, {args.logins / elapsed:.1f} logins/s")
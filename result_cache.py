@@ -0,0 +1,157 @@
+"""
+Analysis Result Cache
+Content-addressed LRU + TTL cache for check-in results, optionally backed by
+SQLite so warm results survive restarts and are shared between processes.
+"""
+
+import copy
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+import metrics
+
+
+def normalize_text(text):
+    """
+    Normalization that cannot change an analysis result: surrounding
+    whitespace and line-ending style are ignored by every rule and vectorizer.
+    """
+    return text.replace('\r\n', '\n').strip()
+
+
+def make_key(text, versions):
+    """
+    Hashes the normalized text together with the model/rule versions, so any
+    retrained artifact produces new keys and old entries are never served.
+    """
+    digest = hashlib.sha256(normalize_text(text).encode('utf-8'))
+    for version in versions:
+        digest.update(b'\0')
+        digest.update(str(version).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _to_json(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _from_json(results):
+    # ml_insights pairs are tuples in fresh results; JSON turns them into lists
+    diag, situ = results
+    if diag.get('ml_insights') is not None:
+        diag['ml_insights'] = [tuple(pair) for pair in diag['ml_insights']]
+    return diag, situ
+
+
+class ResultCache:
+    """
+    Bounded cache of (diagnostic_result, situational_result) pairs.
+
+    Entries expire after `ttl` seconds and the least recently used entry is
+    evicted beyond `max_entries`. With `db_path`, entries are also written
+    to SQLite and memory misses fall through to disk.
+    """
+
+    def __init__(self, max_entries=1024, ttl=3600, db_path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute('''CREATE TABLE IF NOT EXISTS results
+                                (key TEXT PRIMARY KEY, value TEXT, created REAL)''')
+            self._db.commit()
+
+    def get(self, key):
+        """
+        Returns a copy of the cached value for `key`, or None on a miss.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                created, value = entry
+                if now - created < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return copy.deepcopy(value)
+                del self._entries[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, created FROM results WHERE key=?", (key,)).fetchone()
+                if row and now - row[1] < self.ttl:
+                    value = _from_json(json.loads(row[0]))
+                    self._store(key, value, row[1])
+                    self.hits += 1
+                    return copy.deepcopy(value)
+
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        now = time.time()
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._store(key, value, now)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                                 (key, json.dumps(value, default=_to_json), now))
+                self._db.execute("DELETE FROM results WHERE created < ?", (now - self.ttl,))
+                self._db.commit()
+
+    def _store(self, key, value, created):
+        self._entries[key] = (created, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache():
+    """
+    Returns the shared in-memory cache for this process.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResultCache()
+                metrics.get_metrics().add_collector(
+                    lambda: {f"result_cache_{k}": v for k, v in _cache.stats().items()}
+                )
+    return _cache
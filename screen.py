@@ -0,0 +1,280 @@
+"""
+Bulk Screening CLI
+Scores an archive of journal entries offline with both logic.py analyzers.
+Input (CSV or JSONL) is streamed in chunks and scored across a process pool
+whose workers inherit the already-loaded models. Results are written
+incrementally as JSONL (or Parquet part files when pyarrow is installed),
+with a checkpoint after every chunk so an interrupted run can --resume.
+
+    python screen.py journals.csv --out screened.jsonl --jobs 4
+    python screen.py journals.csv --out screened.jsonl --jobs 4 --resume
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+import dataset_access
+import logic
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+_worker = {}
+
+
+def _init_worker():
+    # Forked workers inherit the parent's warm registry and bundle; this only builds the analyzers
+    _worker["diag"] = logic.DiagnosticAssistant()
+    _worker["situ"] = logic.SituationalAnalyzer()
+
+
+def _record(row, doc_id, diag, situ):
+    insights = diag["ml_insights"]
+    return {
+        "row": row,
+        "id": doc_id,
+        "is_emergency": bool(situ["is_emergency"]),
+        "pom_score": int(situ["pom_score"]),
+        "is_ml_risk": bool(situ["is_ml_risk"]),
+        "ml_confidence": float(situ["ml_confidence"]),
+        "top_condition": str(insights[0][0]) if insights else None,
+        "ml_insights": [[str(c), float(p)] for c, p in insights] if insights else None,
+        "rule_based": diag["rule_based"],
+    }
+
+
+def screen_chunk(start, ids, texts):
+    """
+    Scores one chunk; `start` is the input row number of its first entry.
+    """
+    if not _worker:
+        _init_worker()
+    diag_results, situ_results = logic.analyze_checkin_batch(texts, _worker["diag"], _worker["situ"], cache=False)
+    return [
+        _record(start + i, doc_id, d, s)
+        for i, (doc_id, d, s) in enumerate(zip(ids, diag_results, situ_results))
+    ]
+
+
+def _csv_dataset(path, index_dir):
+    """
+    The CSV's row-offset index, with its sidecar files in `index_dir`.
+    """
+    return dataset_access.CsvDataset(path, cache_dir=index_dir)
+
+
+def read_chunks(path, chunksize, text_column="text", id_column=None, skip=0, index_dir=None):
+    """
+    Yields (start_row, ids, texts) chunks from a CSV or JSONL file, starting
+    after the first `skip` entries. CSV chunks are read by seeking through
+    the row-offset index kept in `index_dir` (a temporary one when None), so
+    blank or multi-line records never shift a resumed run.
+    """
+    def clean(values):
+        return ["" if v is None or (isinstance(v, float) and pd.isna(v)) else str(v) for v in values]
+
+    if path.endswith((".jsonl", ".json")):
+        row, start, ids, texts = 0, skip, [], []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                row += 1
+                if row <= skip:
+                    continue
+                entry = json.loads(line)
+                ids.append(entry.get(id_column) if id_column else row - 1)
+                texts.append(entry.get(text_column))
+                if len(texts) == chunksize:
+                    yield start, ids, clean(texts)
+                    start, ids, texts = row, [], []
+        if texts:
+            yield start, ids, clean(texts)
+        return
+
+    if index_dir is None:
+        with tempfile.TemporaryDirectory() as tmp:
+            yield from read_chunks(path, chunksize, text_column, id_column, skip, tmp)
+        return
+    dataset = _csv_dataset(path, index_dir)
+    usecols = [text_column] + ([id_column] if id_column else [])
+    for start in range(skip, dataset.n_rows, chunksize):
+        chunk = dataset.read_rows(start, start + chunksize, columns=usecols)
+        ids = chunk[id_column].tolist() if id_column else list(range(start, start + len(chunk)))
+        yield start, ids, clean(chunk[text_column].tolist())
+
+
+def count_entries(path, index_dir=None):
+    """
+    Number of entries, for progress output (CSV via the row index in `index_dir`).
+    """
+    if path.endswith((".jsonl", ".json")):
+        with open(path, "rb") as f:
+            return sum(1 for line in f if line.strip())
+    if index_dir is None:
+        with tempfile.TemporaryDirectory() as tmp:
+            return _csv_dataset(path, tmp).n_rows
+    return _csv_dataset(path, index_dir).n_rows
+
+
+class JsonlWriter:
+    def __init__(self, path, resume_bytes=None):
+        self.path = path
+        self.f = open(path, "a+b" if resume_bytes is not None else "wb")
+        if resume_bytes is not None:
+            # Drop anything written after the last checkpoint
+            self.f.truncate(resume_bytes)
+            self.f.seek(resume_bytes)
+
+    def write(self, records):
+        self.f.write("".join(json.dumps(r) + "\n" for r in records).encode("utf-8"))
+        self.f.flush()
+        os.fsync(self.f.fileno())
+        return self.f.tell()
+
+    def close(self):
+        self.f.close()
+
+
+class ParquetWriter:
+    """
+    Writes one Parquet part file per chunk into the `path` directory.
+    """
+
+    def __init__(self, path, first_part=0):
+        self.path = path
+        self.part = first_part
+        os.makedirs(path, exist_ok=True)
+
+    def write(self, records):
+        flat = [dict(r, ml_insights=json.dumps(r["ml_insights"]), rule_based=json.dumps(r["rule_based"]),
+                     id=None if r["id"] is None else str(r["id"])) for r in records]
+        tmp = os.path.join(self.path, f".part-{self.part:06d}.parquet")
+        pq.write_table(pa.Table.from_pylist(flat), tmp)
+        os.replace(tmp, os.path.join(self.path, f"part-{self.part:06d}.parquet"))
+        self.part += 1
+        return self.part
+
+    def close(self):
+        pass
+
+
+def _checkpoint_path(out):
+    return out.rstrip("/") + ".checkpoint.json"
+
+
+def _index_dir(out):
+    # Row index sidecars live next to the output, not in the project's .cache/
+    return out.rstrip("/") + ".index"
+
+
+def _save_checkpoint(out, state):
+    path = _checkpoint_path(out)
+    with open(path + ".tmp", "w") as f:
+        json.dump(state, f)
+    os.replace(path + ".tmp", path)
+
+
+def screen(path, out, fmt="jsonl", jobs=None, chunksize=1000, text_column="text", id_column=None, resume=False):
+    """
+    Screens every entry of `path` into `out`. Returns the number of entries
+    scored in this run.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    stat = os.stat(path)
+    source = {"input": os.path.abspath(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+              "chunksize": chunksize, "format": fmt, "text_column": text_column, "id_column": id_column}
+    state = {**source, "rows_done": 0, "position": 0}
+
+    if resume and os.path.exists(_checkpoint_path(out)):
+        with open(_checkpoint_path(out)) as f:
+            saved = json.load(f)
+        if any(saved.get(k) != v for k, v in source.items()):
+            raise SystemExit("Checkpoint does not match this input/settings; rerun without --resume.")
+        state = saved
+        print(f"Resuming after {state['rows_done']} entries", file=sys.stderr)
+
+    if fmt == "parquet":
+        if pq is None:
+            raise SystemExit("Parquet output needs pyarrow; use --format jsonl.")
+        writer = ParquetWriter(out, first_part=state["position"])
+    else:
+        writer = JsonlWriter(out, resume_bytes=state["position"] if state["rows_done"] else None)
+
+    total = count_entries(path, _index_dir(out))
+    chunks = read_chunks(path, chunksize, text_column, id_column, skip=state["rows_done"],
+                         index_dir=_index_dir(out))
+
+    # Load models once in the parent so forked workers share them
+    _init_worker()
+    pool = None
+    if jobs > 1:
+        # fork shares the parent's loaded models (copy-on-write, bundle arrays are mmapped)
+        context = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else None)
+        pool = ProcessPoolExecutor(max_workers=jobs, mp_context=context, initializer=_init_worker)
+    start = time.perf_counter()
+    scored = 0
+    pending = deque()
+    try:
+        def drain(block):
+            nonlocal scored
+            records = block.result() if pool is not None else block
+            state["position"] = writer.write(records)
+            state["rows_done"] += len(records)
+            scored += len(records)
+            _save_checkpoint(out, state)
+            rate = scored / (time.perf_counter() - start)
+            print(f"\r{state['rows_done']}/{total} entries "
+                  f"({state['rows_done'] / max(total, 1):.0%}) | {rate:,.0f} docs/s", end="", file=sys.stderr)
+
+        for chunk in chunks:
+            if pool is None:
+                drain(screen_chunk(*chunk))
+                continue
+            pending.append(pool.submit(screen_chunk, *chunk))
+            # Bounded look-ahead keeps memory flat and output in input order
+            if len(pending) >= 2 * jobs:
+                drain(pending.popleft())
+        while pending:
+            drain(pending.popleft())
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"\nScreened {scored} entries in {elapsed:.1f} s ({scored / max(elapsed, 1e-9):,.0f} docs/s) "
+          f"with {jobs} worker(s) -> {out}", file=sys.stderr)
+    return scored
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline bulk screening of journal entries")
+    parser.add_argument("input", help="CSV or JSONL file")
+    parser.add_argument("--out", required=True, help="JSONL file (or Parquet directory)")
+    parser.add_argument("--format", choices=["jsonl", "parquet"], default="jsonl")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--chunksize", type=int, default=1000)
+    parser.add_argument("--text-column", default="text")
+    parser.add_argument("--id-column", default=None)
+    parser.add_argument("--resume", action="store_true", help="continue from the last checkpoint")
+    args = parser.parse_args()
+
+    screen(args.input, args.out, args.format, args.jobs, args.chunksize, args.text_column,
+           args.id_column, args.resume)
+
+
+if __name__ == "__main__":
+    main()
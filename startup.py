@@ -0,0 +1,112 @@
+"""
+Startup
+Keeps the Streamlit cold start light. The login screen only needs
+streamlit + auth; pandas, plotly, logic and the models are imported by the
+pages that use them, optionally prewarmed on a background thread after
+login, and the login-screen import cost is checked against a budget.
+"""
+
+import importlib
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import metrics
+
+# What app.py imports before the login screen renders
+AUTH_SCREEN_MODULES = ["streamlit", "auth", "metrics", "startup"]
+# Deferred until a page needs them (or the prewarm thread gets there first)
+HEAVY_MODULES = ["pandas", "plotly.express", "logic", "inference_service", "history_store", "dataset_access"]
+
+# Budget for our own login-screen imports on top of streamlit itself
+IMPORT_BUDGET_MS = 100
+
+PREWARM = os.environ.get("MH_PREWARM", "1") != "0"
+PREWARM_SAMPLE = "Prewarm check-in: a little worried about exams but sleeping fine."
+
+status = {"state": "idle", "seconds": None}
+_thread = None
+_lock = threading.Lock()
+
+
+def _prewarm():
+    start = time.perf_counter()
+    status["state"] = "running"
+    try:
+        for name in HEAVY_MODULES:
+            try:
+                importlib.import_module(name)
+            except ImportError as e:
+                print(f"Prewarm Import Error: {e}")
+        import logic
+        import inference_service
+        # Loads every model artifact and the fused featurizer, then one uncached pass
+        logic.analyze_checkin(PREWARM_SAMPLE, cache=False)
+        logic.detect_stressors(PREWARM_SAMPLE)
+        inference_service.get_service()
+        status["state"] = "done"
+    except Exception as e:
+        status["state"] = "failed"
+        print(f"Prewarm Error: {e}")
+    status["seconds"] = time.perf_counter() - start
+    metrics.observe("startup.prewarm", status["seconds"])
+
+
+def prewarm():
+    """
+    Starts the background prewarm once per process (no-op afterwards or
+    when MH_PREWARM=0). Streamlit reruns app.py on every interaction, so the
+    once-only state lives here rather than in the script.
+    """
+    global _thread
+    if not PREWARM or _thread is not None:
+        return
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_prewarm, name="prewarm", daemon=True)
+            _thread.start()
+
+
+def measure_imports(modules):
+    """
+    Imports `modules` in order in a fresh interpreter and returns
+    [(module, milliseconds or None if not installed)].
+    """
+    script = (
+        "import importlib, sys, time\n"
+        "for name in sys.argv[1:]:\n"
+        "    t = time.perf_counter()\n"
+        "    try:\n"
+        "        importlib.import_module(name)\n"
+        "        print(name, (time.perf_counter() - t) * 1e3)\n"
+        "    except ImportError:\n"
+        "        print(name, -1)\n"
+    )
+    out = subprocess.run([sys.executable, "-W", "ignore", "-c", script, *modules], capture_output=True,
+                         text=True, cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout
+    results = []
+    for line in out.splitlines():
+        name, ms = line.rsplit(" ", 1)
+        results.append((name, None if float(ms) < 0 else float(ms)))
+    return results
+
+
+# Import-time budget check
+if __name__ == "__main__":
+    auth_screen = measure_imports(AUTH_SCREEN_MODULES)
+    deferred = measure_imports(AUTH_SCREEN_MODULES + HEAVY_MODULES)[len(AUTH_SCREEN_MODULES):]
+
+    print("Login screen imports:")
+    for name, ms in auth_screen:
+        print(f"  {name:<18} {'not installed' if ms is None else f'{ms:8.1f} ms'}")
+    print("Deferred until first use:")
+    for name, ms in deferred:
+        print(f"  {name:<18} {'not installed' if ms is None else f'{ms:8.1f} ms'}")
+
+    ours = sum(ms for name, ms in auth_screen if name != "streamlit" and ms is not None)
+    skipped = sum(ms for _, ms in deferred if ms is not None)
+    print(f"Project imports before login: {ours:.1f} ms (budget {IMPORT_BUDGET_MS} ms); "
+          f"{skipped:.0f} ms deferred")
+    sys.exit(0 if ours <= IMPORT_BUDGET_MS else 1)
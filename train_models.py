@@ -1,10 +1,32 @@
 import pandas as pd
 import numpy as np
-import re
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import TfidfVectorizer, HashingVectorizer
+from sklearn.linear_model import SGDClassifier
 from sklearn.svm import LinearSVC
 import joblib
+from joblib import Parallel, delayed
 import os
+import time
+try:
+    import resource
+except ImportError: # Windows
+    resource = None
+from model_registry import file_sha256
+from rules import RuleEngine
+
+# Simple Rule-based labeler for training (texts are lowercased first)
+CATEGORIES = {
+    "Anxiety": [r"\bworr(y|ied|ying)\b", r"\banxious\b", r"\banxiety\b", r"\bpanic\b"],
+    "Depression": [r"\bdepress\w*\b", r"\bsad\w*\b", r"\bhopeless\w*\b", r"\bworthless\w*\b"],
+    "Stress": [r"\btrauma\b", r"\bflashback\b", r"\bnightmare\b", r"\bstress\b"]
+}
+LABEL_RULES = RuleEngine(CATEGORIES, flags=0)
+
+def get_label(text):
+    if text is None: return "Normal"
+    text = str(text).lower()
+    if "suicide" in text: return "Suicide"
+    return LABEL_RULES.first_match(text) or "Normal"
 
 # 1. Suicide Risk Model (Binary)
 def train_suicide_risk():
@@ -31,22 +53,6 @@ def train_multi_condition():
     # We use some normal texts from Suicide_Detection and apply rules to generate labels
     df_raw = pd.read_csv('Suicide_Detection.csv').head(5000)
     
-    # Simple Rule-based labeler for training
-    CATEGORIES = {
-        "Anxiety": [r"\bworr(y|ied|ying)\b", r"\banxious\b", r"\banxiety\b", r"\bpanic\b"],
-        "Depression": [r"\bdepress\w*\b", r"\bsad\w*\b", r"\bhopeless\w*\b", r"\bworthless\w*\b"],
-        "Stress": [r"\btrauma\b", r"\bflashback\b", r"\bnightmare\b", r"\bstress\b"]
-    }
-
-    def get_label(text):
-        if text is None: return "Normal"
-        text = str(text).lower()
-        if "suicide" in text: return "Suicide"
-        for cat, markers in CATEGORIES.items():
-            if any(re.search(m, text) for m in markers):
-                return cat
-        return "Normal"
-
     df_raw['label'] = df_raw['text'].apply(get_label)
     
     tfidf = TfidfVectorizer(max_features=5000, stop_words='english')
@@ -60,6 +66,495 @@ def train_multi_condition():
     joblib.dump(tfidf, 'multi_tfidf.pkl')
     print("Multi-Condition Model saved.")
 
+# 3. Parallel Pipeline: parse once, label vectorized, fit every binary problem in parallel
+def label_texts(texts):
+    """Vectorized get_label over a sequence of texts."""
+    lower = pd.Series(texts, dtype=object).map(str).str.lower()
+    labels = np.array([LABEL_RULES.first_match(t) or "Normal" for t in lower], dtype=object)
+    labels[lower.str.contains("suicide", regex=False).values] = "Suicide"
+    return labels
+
+def _fit_vectorizer(texts):
+    tfidf = TfidfVectorizer(max_features=5000, stop_words='english')
+    return tfidf, tfidf.fit_transform(texts)
+
+def _fit_binary(X, y):
+    model = LinearSVC(dual=False)
+    model.fit(X, y)
+    return model
+
+def _assemble_ovr(binaries, classes, n_features):
+    # liblinear's multi-class mode is exactly these one-vs-rest problems
+    model = LinearSVC(dual=False)
+    model.classes_ = np.asarray(classes)
+    model.coef_ = np.vstack([b.coef_ for b in binaries])
+    model.intercept_ = np.concatenate([b.intercept_ for b in binaries])
+    model.n_features_in_ = n_features
+    model.n_iter_ = max(b.n_iter_ for b in binaries)
+    return model
+
+def train_pipeline(csv_path='Suicide_Detection.csv', n_jobs=-1):
+    """
+    Same models as train_suicide_risk + train_multi_condition, but the CSV
+    is parsed once, both vectorizers are fitted in parallel, and the
+    suicide model plus every one-vs-rest class of the multi-condition model
+    are fitted as independent binary problems across a process pool.
+    """
+    timings = {}
+    stage = time.perf_counter()
+
+    def lap(name):
+        nonlocal stage
+        now = time.perf_counter()
+        timings[name] = now - stage
+        stage = now
+
+    print("Training pipeline (parallel)...")
+    df = pd.read_csv(csv_path, usecols=['text', 'class'], nrows=10000) # Sample for speed
+    suicide_texts = df['text'].values.astype('U')
+    multi_texts = suicide_texts[:5000]
+    lap("parse")
+
+    y_suicide = df['class'].map({'suicide': 1, 'non-suicide': 0})
+    y_multi = label_texts(df['text'].values[:5000])
+    classes = np.unique(y_multi)
+    lap("label")
+
+    with Parallel(n_jobs=n_jobs) as parallel:
+        (suicide_tfidf, X_suicide), (multi_tfidf, X_multi) = parallel(
+            delayed(_fit_vectorizer)(texts) for texts in (suicide_texts, multi_texts))
+        lap("vectorize")
+
+        jobs = [delayed(_fit_binary)(X_suicide, y_suicide)]
+        jobs += [delayed(_fit_binary)(X_multi, (y_multi == c).astype(int)) for c in classes]
+        suicide_model, *class_models = parallel(jobs)
+        multi_model = _assemble_ovr(class_models, classes, X_multi.shape[1])
+        lap("fit")
+
+    joblib.dump(suicide_model, 'suicide_svm_model.pkl')
+    joblib.dump(suicide_tfidf, 'tfidf_vectorizer.pkl')
+    joblib.dump(multi_model, 'multi_svm_model.pkl')
+    joblib.dump(multi_tfidf, 'multi_tfidf.pkl')
+    lap("save")
+
+    train_calibration(csv_path)
+    lap("calibrate")
+
+    print("Stage timings:")
+    for name, seconds in timings.items():
+        print(f"  {name:<10} {seconds:7.2f} s")
+    print(f"  {'total':<10} {sum(timings.values()):7.2f} s")
+    print("Suicide Risk and Multi-Condition Models saved.")
+    return timings
+
+MULTI_CLASSES = np.array(["Anxiety", "Depression", "Normal", "Stress", "Suicide"])
+
+def _peak_rss_mb():
+    if resource is None:
+        return float('nan')
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 # KiB on Linux
+
+# 4. Streaming Mode: both models from one chunked pass over the full corpus
+def train_streaming(csv_path='Suicide_Detection.csv', chunksize=20000, n_features=2 ** 18):
+    """
+    Reads the CSV once in chunks and feeds both pipelines from the same
+    hashed features with partial_fit, so the whole corpus trains in
+    bounded memory. Writes the standard artifact names, so logic.py serves
+    the streamed models without changes.
+    """
+    print(f"Streaming training over {csv_path} (chunks of {chunksize})...")
+    # Stateless, so one transform per chunk serves both models
+    vec = HashingVectorizer(n_features=n_features, stop_words='english', alternate_sign=False)
+    suicide_model = SGDClassifier(loss='hinge', alpha=1e-5, random_state=42)
+    multi_model = SGDClassifier(loss='hinge', alpha=1e-5, random_state=42)
+
+    total_rows, start = 0, time.perf_counter()
+    for i, chunk in enumerate(pd.read_csv(csv_path, usecols=['text', 'class'], chunksize=chunksize)):
+        chunk_start = time.perf_counter()
+        chunk = chunk.dropna(subset=['class'])
+        texts = chunk['text'].values.astype('U')
+        X = vec.transform(texts)
+
+        y_suicide = chunk['class'].map({'suicide': 1, 'non-suicide': 0})
+        known = y_suicide.notna().values
+        if known.any():
+            suicide_model.partial_fit(X[known], y_suicide[known].astype(int), classes=np.array([0, 1]))
+        y_multi = np.array([get_label(t) for t in texts])
+        multi_model.partial_fit(X, y_multi, classes=MULTI_CLASSES)
+
+        total_rows += len(chunk)
+        print(f"  chunk {i:>4}: {len(chunk):>6} rows | {time.perf_counter() - chunk_start:6.2f} s "
+              f"| peak RSS {_peak_rss_mb():8.1f} MB | {total_rows} rows total")
+
+    joblib.dump(suicide_model, 'suicide_svm_model.pkl')
+    joblib.dump(vec, 'tfidf_vectorizer.pkl')
+    joblib.dump(multi_model, 'multi_svm_model.pkl')
+    joblib.dump(vec, 'multi_tfidf.pkl')
+    print(f"Streaming models saved ({total_rows} rows in {time.perf_counter() - start:.1f} s).")
+
+# 5. Compact Bundle Export (loaded by logic.load_bundle)
+def _prune_mask(coef, idf, prune):
+    # A term's largest contribution per unit of TF, relative to the model's largest
+    importance = np.abs(coef).max(axis=0) * idf
+    return importance > prune * importance.max()
+
+def _quantize(weights):
+    """int8 term-major table plus one scale per class (weight ~= q * scale)."""
+    scale = np.abs(weights).max(axis=0) / 127
+    scale[scale == 0] = 1
+    q = np.clip(np.rint(weights / scale), -127, 127).astype(np.int8)
+    return q, scale.astype(np.float32)
+
+# Older bundle versions kept next to the current one
+KEEP_BUNDLE_VERSIONS = 2
+
+def export_bundle(out_dir='model_bundle', dtype=np.float32, prune=0.0, weights='float', suicide_prune=None,
+                  suicide_weights=None, activate=True):
+    """
+    Writes the four pickles as one versioned bundle of raw .npy arrays:
+    the union vocabulary as a UTF-8 blob + offsets with a (token -> column
+    per model) table, IDF vectors and term-major coefficient tables in
+    `dtype`. Everything numeric can be opened with np.load(mmap_mode='r').
+
+    Compact variant: `prune` drops, per model, the weight rows of the terms
+    whose largest |weight| * idf is below that fraction of the model's
+    largest. Pruned terms keep their IDF and move past the model's
+    n_features as norm-only columns, so TF-IDF norms stay exact.
+    weights='int8' stores the coefficient tables as int8 with one float32
+    scale per class. `suicide_prune` / `suicide_weights` override both for
+    the suicide-risk model.
+
+    Returns the path of the written manifest; with activate=False it is a
+    staged copy that activate_bundle() switches to.
+    """
+    import json
+    import secrets
+    from datetime import datetime
+    from featurizer import FusedTfidfFeaturizer
+    from logic import BUNDLE_FORMAT
+
+    sources = ['multi_tfidf.pkl', 'tfidf_vectorizer.pkl', 'multi_svm_model.pkl', 'suicide_svm_model.pkl']
+    multi_vec, suicide_vec, multi_model, suicide_model = (joblib.load(name) for name in sources)
+    # Raises ValueError for vectorizers the fused featurizer cannot reproduce
+    FusedTfidfFeaturizer.from_vectorizers(multi_vec, suicide_vec)
+
+    arrays = {}
+    vocabularies = []
+    n_features = {}
+    suicide_prune = prune if suicide_prune is None else suicide_prune
+    suicide_weights = suicide_weights or weights
+    for name, vec, model, prune_at, table_weights in (
+            ('multi', multi_vec, multi_model, prune, weights),
+            ('suicide', suicide_vec, suicide_model, suicide_prune, suicide_weights)):
+        coef = model.coef_.toarray() if hasattr(model.coef_, 'toarray') else model.coef_
+        keep = _prune_mask(coef, vec.idf_, prune_at) if prune_at > 0 else np.ones(len(vec.idf_), dtype=bool)
+        # Kept terms first, then the norm-only ones
+        order = np.concatenate([np.flatnonzero(keep), np.flatnonzero(~keep)])
+        remap = np.empty_like(order)
+        remap[order] = np.arange(len(order))
+        vocabularies.append({t: int(remap[c]) for t, c in vec.vocabulary_.items()})
+        n_features[name] = int(keep.sum())
+        arrays[f'{name}_idf'] = vec.idf_[order].astype(dtype)
+        table = np.ascontiguousarray(coef[:, order[:n_features[name]]].T, dtype=dtype)
+        if table_weights == 'int8':
+            table, arrays[f'{name}_weight_scale'] = _quantize(table)
+        arrays[f'{name}_weights'] = table
+        arrays[f'{name}_intercept'] = model.intercept_.astype(dtype)
+
+    tokens = sorted(set(vocabularies[0]) | set(vocabularies[1]))
+    columns = np.full((len(tokens), 2), -1, dtype=np.int32)
+    for i, token in enumerate(tokens):
+        columns[i, 0] = vocabularies[0].get(token, -1)
+        columns[i, 1] = vocabularies[1].get(token, -1)
+    encoded = [t.encode('utf-8') for t in tokens]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int32)
+    offsets[1:] = np.cumsum([len(b) for b in encoded])
+    arrays.update({
+        'vocab_blob': np.frombuffer(b''.join(encoded), dtype=np.uint8),
+        'vocab_offsets': offsets,
+        'columns': columns,
+    })
+
+    # Every export goes to a fresh directory: running workers keep their mmapped
+    # arrays intact and only switch when they see the new manifest
+    version = datetime.now().strftime('%Y%m%dT%H%M%S%f') + '-' + secrets.token_hex(3)
+    os.makedirs(os.path.join(out_dir, version))
+    for name, arr in arrays.items():
+        np.save(os.path.join(out_dir, version, f'{name}.npy'), arr)
+
+    manifest = {
+        'format': BUNDLE_FORMAT,
+        'version': version,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'dtype': np.dtype(dtype).name,
+        'weights': weights,
+        'suicide_weights': suicide_weights,
+        'prune': prune,
+        'suicide_prune': suicide_prune,
+        'n_features': n_features,
+        'token_pattern': multi_vec.token_pattern,
+        'multi_classes': multi_model.classes_.tolist(),
+        'suicide_classes': suicide_model.classes_.tolist(),
+        'arrays': {name: f'{version}/{name}.npy' for name in arrays},
+        'sources': {name: file_sha256(name) for name in sources},
+    }
+    # Manifest last: readers only see a bundle once every array is in place.
+    # Staged next to manifest.json so its relative array paths resolve the same.
+    staged = os.path.join(out_dir, f'manifest-{version}.json')
+    with open(staged, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    size_kb = sum(arr.nbytes for arr in arrays.values()) / 1024
+    print(f"Model bundle written to {out_dir}/{version}/ ({size_kb:.0f} KB of arrays, {len(tokens)} tokens).")
+    return activate_bundle(staged) if activate else staged
+
+def activate_bundle(staged):
+    """Atomically makes a staged manifest the served one and drops old versions."""
+    import json
+    import shutil
+
+    out_dir = os.path.dirname(staged)
+    with open(staged) as f:
+        version = json.load(f)['version']
+    manifest_path = os.path.join(out_dir, 'manifest.json')
+    os.replace(staged, manifest_path)
+
+    # Keep the previous versions for workers that have not reloaded yet
+    # (unlinking a mapped file is safe on POSIX; Windows may refuse, which is fine)
+    versions = sorted(d for d in os.listdir(out_dir) if os.path.isdir(os.path.join(out_dir, d)) and d != version)
+    for old in versions[:-KEEP_BUNDLE_VERSIONS]:
+        shutil.rmtree(os.path.join(out_dir, old), ignore_errors=True)
+    return manifest_path
+
+def discard_bundle(staged):
+    """Removes a staged export that was never activated."""
+    import json
+    import shutil
+
+    with open(staged) as f:
+        version = json.load(f)['version']
+    shutil.rmtree(os.path.join(os.path.dirname(staged), version), ignore_errors=True)
+    os.remove(staged)
+
+def _require_tfidf_artifacts():
+    # Streaming training saves HashingVectorizers, which have no vocabulary to export
+    for name in ('multi_tfidf.pkl', 'tfidf_vectorizer.pkl'):
+        vec = joblib.load(name)
+        if not isinstance(vec, TfidfVectorizer):
+            raise SystemExit(f"{name} holds a {type(vec).__name__}: model bundles need the TF-IDF artifacts "
+                             f"of the default (non-streaming) training. Retrain without --streaming first.")
+
+def _heldout_set(csv_path='Suicide_Detection.csv', n=5000):
+    """
+    Texts the pickled models were not fitted on: the labelled rows after the
+    10000 used for training. Without the CSV, synthetic journals stand in for
+    agreement checks; they have no labels (y is None), since the generator
+    is not a sample of real journals. Returns (texts, y, source).
+    """
+    if os.path.exists(csv_path):
+        df = pd.read_csv(csv_path, usecols=['text', 'class'], skiprows=range(1, 10001), nrows=n)
+        df = df[df['class'].isin(['suicide', 'non-suicide'])]
+        y = (df['class'] == 'suicide').astype(int).values
+        return df['text'].values.astype('U').tolist(), y, csv_path
+    from benchmark import make_corpus
+    per = n // 4
+    texts = []
+    for size in ('short', 'typical'):
+        for crisis in (False, True):
+            texts += make_corpus(size, crisis, n=per)
+    return texts, None, "synthetic journals (benchmark.make_corpus)"
+
+def _heap_kb(load):
+    import tracemalloc
+    tracemalloc.start()
+    obj = load()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del obj
+    return size / 1024
+
+def compress_bundle(out_dir='model_bundle', prune=0.005, weights='int8', suicide_prune=0.0,
+                    suicide_weights='float', csv_path='Suicide_Detection.csv'):
+    """
+    Exports the compact bundle and reports memory saved and agreement with
+    the original pickled models on held-out texts. The bundle is only
+    activated when every suicide-risk prediction agrees, so by default only
+    the multi-condition model is compressed: int8 rounding or pruning of
+    the suicide-risk table already flips scores near its decision boundary.
+    """
+    from logic import load_bundle
+
+    staged = export_bundle(out_dir, np.float32, prune=prune, weights=weights, suicide_prune=suicide_prune,
+                           suicide_weights=suicide_weights, activate=False)
+    bundle = load_bundle(staged)
+
+    sources = ['multi_tfidf.pkl', 'tfidf_vectorizer.pkl', 'multi_svm_model.pkl', 'suicide_svm_model.pkl']
+    multi_vec, suicide_vec, multi_model, suicide_model = (joblib.load(name) for name in sources)
+    texts, _, source = _heldout_set(csv_path)
+
+    multi_d = multi_model.decision_function(multi_vec.transform(texts))
+    suicide_d = suicide_model.decision_function(suicide_vec.transform(texts))
+    X_multi, X_suicide = bundle.featurizer.transform(texts)
+    compact_multi_d = bundle.multi_scorer.decision_function(X_multi)
+    compact_suicide_d = bundle.suicide_scorer.decision_function(X_suicide)
+
+    pickles_kb = _heap_kb(lambda: [joblib.load(name) for name in sources])
+    compact_kb = _heap_kb(lambda: load_bundle(staged))
+    full_arrays_kb = sum(a.nbytes for a in (multi_vec.idf_, suicide_vec.idf_, multi_model.coef_,
+                                            suicide_model.coef_)) / 1024
+    compact_arrays_kb = sum(os.path.getsize(os.path.join(out_dir, f))
+                            for f in bundle.manifest['arrays'].values()) / 1024
+    suicide_agreement = np.mean((suicide_d > 0) == (compact_suicide_d > 0))
+
+    print(f"Compression report (multi prune={prune} {weights}, suicide prune={suicide_prune} {suicide_weights}, "
+          f"{len(texts)} held-out texts from {source}):")
+    print(f"  scored terms    multi {len(multi_vec.vocabulary_)} -> {bundle.featurizer.n_features[0]}, "
+          f"suicide {len(suicide_vec.vocabulary_)} -> {bundle.featurizer.n_features[1]}")
+    print(f"  numeric arrays  {full_arrays_kb:7.0f} KB float64 -> {compact_arrays_kb:5.0f} KB on disk (mmapped, shared)")
+    print(f"  private heap    {pickles_kb:7.0f} KB (four pickles) -> {compact_kb:5.0f} KB per worker")
+    print(f"  multi-condition top class agreement {np.mean(multi_d.argmax(1) == compact_multi_d.argmax(1)):.2%}, "
+          f"max |decision delta| {np.abs(multi_d - compact_multi_d).max():.4f}")
+    print(f"  suicide risk    prediction agreement {suicide_agreement:.2%}, "
+          f"max |decision delta| {np.abs(suicide_d - compact_suicide_d).max():.4f}")
+
+    # A missed crisis is not an acceptable compression artifact
+    if suicide_agreement < 1:
+        del bundle
+        discard_bundle(staged)
+        raise SystemExit(f"Compact bundle not activated: suicide-risk predictions changed on "
+                         f"{np.sum((suicide_d > 0) != (compact_suicide_d > 0))} texts. Try a lower --suicide-prune.")
+    activate_bundle(staged)
+    print(f"Compact bundle activated ({out_dir}/manifest.json).")
+
+# 6. Calibration: decision scores -> probabilities, fitted on held-out rows
+CALIBRATION = 'calibration.json'
+
+def train_calibration(csv_path='Suicide_Detection.csv', method='isotonic', n=5000):
+    """
+    Fits lookup-table calibration for both pickled models on one half of
+    the held-out set, reports Brier score and ECE against the current
+    softmax/sigmoid on the other half, and saves it for logic.py.
+    Returns None without fitting when there is no real held-out split.
+    """
+    from calibration import Calibration, brier, expected_calibration_error
+
+    texts, y_suicide, source = _heldout_set(csv_path, n)
+    if y_suicide is None or len(np.unique(y_suicide)) < 2:
+        print(f"Calibration skipped: it needs labelled held-out rows from {csv_path} "
+              f"(synthetic journals are not used). logic.py keeps the softmax/sigmoid confidences.")
+        return None
+
+    print(f"Fitting {method} calibration...")
+    sources = ['multi_tfidf.pkl', 'tfidf_vectorizer.pkl', 'multi_svm_model.pkl', 'suicide_svm_model.pkl']
+    multi_vec, suicide_vec, multi_model, suicide_model = (joblib.load(name) for name in sources)
+    y_multi = label_texts(texts)
+    d_multi = multi_model.decision_function(multi_vec.transform(texts))
+    d_suicide = suicide_model.decision_function(suicide_vec.transform(texts))
+
+    fit, test = slice(0, None, 2), slice(1, None, 2)
+    calibration = Calibration.fit(d_multi[fit], y_multi[fit], multi_model.classes_.tolist(),
+                                  d_suicide[fit], y_suicide[fit], method)
+    calibration.info = {'heldout': source, 'n': len(texts[fit]),
+                        'models': {name: file_sha256(name) for name in sources}}
+
+    # Suicide risk: P(class 1)
+    y = y_suicide[test].astype(float)
+    raw = 1 / (1 + np.exp(-d_suicide[test]))
+    cal = calibration.suicide_probs(d_suicide[test])
+    print(f"  suicide risk    Brier {brier(raw, y):.4f} -> {brier(cal, y):.4f}, "
+          f"ECE {expected_calibration_error(raw, y):.4f} -> {expected_calibration_error(cal, y):.4f}")
+
+    # Multi-condition: confidence of the top class
+    d = d_multi[test]
+    exp_d = np.exp(d - d.max(axis=1, keepdims=True))
+    raw = exp_d / exp_d.sum(axis=1, keepdims=True)
+    cal = calibration.multi_probs(d)
+    onehot = (y_multi[test][:, None] == multi_model.classes_[None, :]).astype(float)
+    for name, probs in (('softmax', raw), ('calibrated', cal)):
+        top = probs.argmax(axis=1)
+        correct = (multi_model.classes_[top] == y_multi[test]).astype(float)
+        print(f"  multi-condition {name:<10} Brier {np.mean(np.sum((probs - onehot) ** 2, axis=1)):.4f}, "
+              f"top-class ECE {expected_calibration_error(probs.max(axis=1), correct):.4f}")
+
+    calibration.save(CALIBRATION)
+    print(f"Calibration saved to {CALIBRATION} ({len(texts[fit])} held-out texts from {source}).")
+    return calibration
+
+# 7. Demographic models (Predictive_Modeling.ipynb), served by demographic_model.py
+def train_demographic(csv_path='Student Mental health.csv', n_jobs=-1):
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.metrics import accuracy_score
+    from sklearn.model_selection import train_test_split
+    from feature_engineering import ENCODERS_PATH, SurveyEncoders, build_features
+    from demographic_model import DEP_FEATURES, DEP_MODEL, RISK_FEATURES, RISK_MODEL
+
+    print("Training Demographic Risk Models...")
+    df = pd.read_csv(csv_path)
+    # Encoders are refitted with the models so codes always match the trees
+    encoders = SurveyEncoders.fit(df)
+    features = build_features(df, encoders)
+
+    y_dep = features['Depression_Bin']
+    X_train, X_test, y_train, y_test = train_test_split(
+        features[DEP_FEATURES], y_dep, test_size=0.2, random_state=42, stratify=y_dep)
+    model_dep = RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=n_jobs)
+    model_dep.fit(X_train, y_train)
+    print(f"Depression model accuracy: {accuracy_score(y_test, model_dep.predict(X_test)):.2f}")
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        features[RISK_FEATURES], features['Risk_Score'], test_size=0.2, random_state=42)
+    model_risk = RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=n_jobs)
+    model_risk.fit(X_train, y_train)
+    print(f"Risk level model accuracy: {accuracy_score(y_test, model_risk.predict(X_test)):.2f}")
+
+    encoders.save(ENCODERS_PATH)
+    joblib.dump(model_dep, DEP_MODEL)
+    joblib.dump(model_risk, RISK_MODEL)
+    print(f"Demographic models saved ({DEP_MODEL}, {RISK_MODEL}, {ENCODERS_PATH}).")
+
 if __name__ == "__main__":
-    train_suicide_risk()
-    train_multi_condition()
+    import argparse
+    parser = argparse.ArgumentParser(description="Train the suicide-risk and multi-condition models.")
+    parser.add_argument("--streaming", action="store_true",
+                        help="train on the full CSV in chunks (HashingVectorizer + SGD)")
+    parser.add_argument("--chunksize", type=int, default=20000)
+    parser.add_argument("--sequential", action="store_true",
+                        help="run the original one-model-at-a-time training")
+    parser.add_argument("--jobs", type=int, default=-1, help="worker processes for the parallel pipeline")
+    parser.add_argument("--export-bundle", action="store_true",
+                        help="only export the current pickles as model_bundle/ for fast loading")
+    parser.add_argument("--compress", action="store_true",
+                        help="export a pruned, int8-quantized model_bundle/ and report agreement")
+    parser.add_argument("--prune", type=float, default=0.005,
+                        help="relative weight*idf below which a multi-condition term is pruned (with --compress)")
+    parser.add_argument("--suicide-prune", type=float, default=0.0,
+                        help="same for the suicide-risk model; the bundle is only activated if no prediction changes")
+    parser.add_argument("--calibrate", choices=["isotonic", "platt"], nargs="?", const="isotonic",
+                        help="only refit calibration.json for the current pickles")
+    parser.add_argument("--demographic", action="store_true",
+                        help="train the survey RandomForest models (depression / risk level)")
+    args = parser.parse_args()
+
+    if args.demographic:
+        train_demographic(n_jobs=args.jobs)
+    elif args.calibrate:
+        if train_calibration(method=args.calibrate) is None:
+            raise SystemExit(1)
+    elif args.compress:
+        _require_tfidf_artifacts()
+        compress_bundle(prune=args.prune, suicide_prune=args.suicide_prune)
+    elif args.export_bundle:
+        _require_tfidf_artifacts()
+        export_bundle()
+    elif args.streaming:
+        train_streaming(chunksize=args.chunksize)
+        # Every row was used for training, so there is no held-out set to refit on
+        if os.path.exists(CALIBRATION):
+            os.remove(CALIBRATION)
+            print(f"Removed {CALIBRATION}: it was fitted for the previous models.")
+    elif args.sequential:
+        train_suicide_risk()
+        train_multi_condition()
+        train_calibration()
+    else:
+        train_pipeline(n_jobs=args.jobs)
@@ -0,0 +1,245 @@
+"""
+User Store
+SQLite access layer for auth.py: a small shared pool of long-lived WAL-mode
+connections, fixed (statement-cached) SQL and a one-time schema migration.
+"""
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# Migrations indexed by target schema version (PRAGMA user_version)
+MIGRATIONS = {
+    1: ['''CREATE TABLE IF NOT EXISTS users
+           (username TEXT PRIMARY KEY, password_hash TEXT, salt TEXT, email TEXT)'''],
+    # Check-in history (history_store.py): raw append-only log + incremental rollups
+    2: ['''CREATE TABLE IF NOT EXISTS checkins
+           (id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT NOT NULL, created_at TEXT NOT NULL,
+            pom_score INTEGER, top_condition TEXT, is_emergency INTEGER, ml_insights TEXT)''',
+        '''CREATE INDEX IF NOT EXISTS idx_checkins_user ON checkins (username, created_at)''',
+        '''CREATE TABLE IF NOT EXISTS checkin_rollups
+           (username TEXT, period TEXT, bucket TEXT, checkins INTEGER, pom_sum REAL, emergencies INTEGER,
+            PRIMARY KEY (username, period, bucket))''',
+        '''CREATE TABLE IF NOT EXISTS checkin_conditions
+           (username TEXT, period TEXT, bucket TEXT, condition TEXT, checkins INTEGER,
+            PRIMARY KEY (username, period, bucket, condition))'''],
+}
+
+INSERT_USER = "INSERT INTO users VALUES (?, ?, ?, ?)"
+SELECT_CREDENTIALS = "SELECT password_hash, salt FROM users WHERE username=?"
+UPDATE_PASSWORD = "UPDATE users SET password_hash=?, salt=? WHERE username=?"
+
+
+class UserStore:
+    """
+    Thread-safe user table backed by a bounded pool of shared connections.
+
+    sqlite3 caches prepared statements per connection keyed by SQL text, so
+    keeping connections open and the SQL constant means every query after
+    the first skips parsing and planning. Connections are not tied to a
+    thread: Streamlit runs every rerun on a new thread, and each one checks
+    out an already warm connection.
+    """
+
+    def __init__(self, path='users.db', timeout=5.0, pool_size=4):
+        self.path = path
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self._idle = queue.Queue(maxsize=pool_size)
+        self._connections = []
+        self._lock = threading.Lock()
+        self._migrated = False
+
+    def _open(self):
+        # Handed between threads by the pool, never used by two at once
+        conn = sqlite3.connect(self.path, timeout=self.timeout, cached_statements=64,
+                               check_same_thread=False)
+        # WAL lets readers proceed while a writer commits
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """
+        Checks a connection out of the pool for the duration of the block,
+        opening a new one only while fewer than `pool_size` exist. Raises
+        sqlite3.OperationalError if none is returned within `timeout`.
+        """
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+            with self._lock:
+                if len(self._connections) < self.pool_size:
+                    conn = self._open()
+                    self._connections.append(conn)
+            if conn is None:
+                try:
+                    conn = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise sqlite3.OperationalError("User store connection pool exhausted") from None
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            with self._lock:
+                pooled = conn in self._connections
+            if pooled:
+                self._idle.put(conn)
+            else:
+                # Dropped by close() while checked out
+                conn.close()
+
+    def migrate(self):
+        """
+        Brings the schema up to date. Runs once per process; later calls are free.
+        """
+        if self._migrated:
+            return
+        with self._lock:
+            if self._migrated:
+                return
+            conn = sqlite3.connect(self.path, timeout=self.timeout)
+            try:
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+                for target in sorted(v for v in MIGRATIONS if v > version):
+                    with conn:
+                        for statement in MIGRATIONS[target]:
+                            conn.execute(statement)
+                        conn.execute(f"PRAGMA user_version={target}")
+            finally:
+                conn.close()
+            self._migrated = True
+
+    def add_user(self, username, password_hash, salt, email=""):
+        """
+        Inserts a user. Returns False if the username is already taken.
+        """
+        self.migrate()
+        with self.connection() as conn:
+            try:
+                with conn:
+                    conn.execute(INSERT_USER, (username, password_hash, salt, email))
+                return True
+            except sqlite3.IntegrityError:
+                return False
+
+    def get_credentials(self, username):
+        """
+        Returns (password_hash, salt) for `username`, or None.
+        """
+        self.migrate()
+        with self.connection() as conn:
+            return conn.execute(SELECT_CREDENTIALS, (username,)).fetchone()
+
+    def update_password(self, username, password_hash, salt):
+        """
+        Replaces the stored hash and salt, e.g. after a scheme upgrade.
+        """
+        self.migrate()
+        with self.connection() as conn, conn:
+            conn.execute(UPDATE_PASSWORD, (password_hash, salt, username))
+
+    def close(self):
+        """
+        Closes the idle connections; checked-out ones close when returned.
+        """
+        with self._lock:
+            while True:
+                try:
+                    self._idle.get_nowait().close()
+                except queue.Empty:
+                    break
+            self._connections.clear()
+
+
+# Benchmark: concurrent register/login traffic
+if __name__ == "__main__":
+    import argparse
+    import os
+    import tempfile
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    import numpy as np
+
+    parser = argparse.ArgumentParser(description="Concurrent register/login benchmark")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=4000, help="operations per mode")
+    args = parser.parse_args()
+
+    def connect_per_call(path):
+        # The original auth.py access pattern
+        def add(username):
+            conn = sqlite3.connect(path)
+            try:
+                conn.execute(INSERT_USER, (username, "h", "s", ""))
+                conn.commit()
+            except sqlite3.IntegrityError:
+                pass
+            finally:
+                conn.close()
+
+        def get(username):
+            conn = sqlite3.connect(path)
+            row = conn.execute(SELECT_CREDENTIALS, (username,)).fetchone()
+            conn.close()
+            return row
+        return add, get
+
+    def pooled(path):
+        store = UserStore(path)
+        return (lambda username: store.add_user(username, "h", "s", "")), store.get_credentials
+
+    def run_on_fresh_threads(op, n, concurrency):
+        # Like Streamlit: every operation runs on a thread of its own
+        latencies = [None] * n
+        slots = threading.BoundedSemaphore(concurrency)
+
+        def run(i):
+            try:
+                latencies[i] = op(i)
+            finally:
+                slots.release()
+
+        workers = []
+        for i in range(n):
+            slots.acquire()
+            worker = threading.Thread(target=run, args=(i,))
+            worker.start()
+            workers.append(worker)
+        for worker in workers:
+            worker.join()
+        return latencies
+
+    for name, factory in (("connect-per-call", connect_per_call), ("pooled WAL", pooled)):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bench.db")
+            UserStore(path).migrate()
+            add, get = factory(path)
+
+            def op(i):
+                start = time.perf_counter()
+                # One registration for every four logins
+                if i % 5 == 0:
+                    add(f"user{i}")
+                else:
+                    get(f"user{i - i % 5}")
+                return time.perf_counter() - start
+
+            for threads in ("long-lived", "fresh"):
+                start = time.perf_counter()
+                if threads == "long-lived":
+                    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+                        latencies = np.array(list(pool.map(op, range(args.ops))))
+                else:
+                    latencies = np.array(run_on_fresh_threads(op, args.ops, args.threads))
+                elapsed = time.perf_counter() - start
+
+                p50, p99 = np.percentile(latencies, [50, 99]) * 1e3
+                print(f"{name:>16} ({threads:>10} threads): {args.ops / elapsed:8.0f} ops/s "
+                      f"| p50 {p50:.3f} ms | p99 {p99:.3f} ms")